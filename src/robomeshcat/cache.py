@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-16
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from functools import lru_cache
+from typing import Callable
+
+import numpy as np
+
+
+def estimate_nbytes(value) -> int:
+    """Estimate memory used by the cached value, i.e. by the strings, bytes and numpy arrays it holds."""
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v) for v in value.values())
+    attributes = dict(getattr(value, '__dict__', {}))
+    for cls in type(value).__mro__:  # attributes stored in slots are not listed by vars()
+        slots = cls.__dict__.get('__slots__', ())
+        for name in [slots] if isinstance(slots, str) else slots:
+            if name not in ('__dict__', '__weakref__') and hasattr(value, name):
+                attributes[name] = getattr(value, name)
+    return estimate_nbytes(attributes) if attributes else 0
+
+
+class LRUCache:
+    """Thread-safe least recently used cache with the limit on the total size of the stored values. The least
+    recently used values are evicted if the limit is exceeded."""
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__()
+        self.max_bytes = max_bytes
+        self._values: OrderedDict = OrderedDict()  # key -> (value, size)
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self._key_locks: dict = {}  # key -> lock held while the value of the key is created
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    @property
+    def nbytes(self) -> int:
+        """Total estimated size of the stored values."""
+        return self._nbytes
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._values:
+                return default
+            self._values.move_to_end(key)
+            return self._values[key][0]
+
+    def put(self, key, value, nbytes: int | None = None):
+        """Store the value and evict the least recently used values if the size limit is exceeded. Values larger than
+        the limit are not stored at all."""
+        nbytes = estimate_nbytes(value) if nbytes is None else nbytes
+        with self._lock:
+            if key in self._values:
+                self._nbytes -= self._values.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return
+            self._values[key] = (value, nbytes)
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                self._nbytes -= self._values.popitem(last=False)[1][1]
+
+    def get_or_create(self, key, create: Callable):
+        """Return the cached value or create it by calling :param create and store it. Values of different keys are
+        created in parallel, the value of the same key is created only once."""
+        value = self.get(key, default=self)
+        if value is not self:
+            return value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                value = self.get(key, default=self)
+                if value is self:
+                    value = create()
+                    self.put(key, value)
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self._nbytes = 0
+
+
+def file_cache_key(path: str | Path, *args) -> tuple:
+    """Key identifying the content of the file by its resolved path, modification time and size, extended by
+    additional hashable arguments (e.g. scale)."""
+    path = Path(path).resolve()
+    stat = os.stat(path)
+    return (str(path), stat.st_mtime_ns, stat.st_size) + args
+
+
+def file_hash(path: str | Path) -> str:
+    """Return sha256 hash of the file content."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(2**20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def library_version() -> str:
+    try:
+        from importlib.metadata import version  # python >= 3.8
+
+        return version('robomeshcat')
+    except Exception:
+        return 'unknown'
+
+
+def default_cache_directory() -> Path:
+    """Directory given by ROBOMESHCAT_CACHE_DIR environment variable or ~/.cache/robomeshcat by default."""
+    directory = os.environ.get('ROBOMESHCAT_CACHE_DIR')
+    return Path(directory) if directory else Path.home() / '.cache' / 'robomeshcat'
+
+
+class DiskCache:
+    """Persistent cache of dictionaries of numpy arrays stored as npz files in the cache directory. The file name is a
+    hash of the key extended by the library version, so that entries of other versions are never used. The least
+    recently used files (e.g. of other versions) are removed if the total size exceeds the limit. Failures of reading
+    and writing (e.g. read-only file system) are ignored, i.e. the value is considered not cached."""
+
+    format_version = 4
+
+    def __init__(self, directory: str | Path | None, max_bytes: int = 2**30) -> None:
+        """:param directory: directory of the cache files, caching is disabled if None
+        :param max_bytes: limit of the total size of the cache files
+        """
+        super().__init__()
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _file(self, key) -> Path:
+        key = repr((self.format_version, library_version()) + tuple(key))
+        return Path(self.directory) / f'{hashlib.sha256(key.encode()).hexdigest()}.npz'
+
+    def get(self, key) -> dict[str, np.ndarray] | None:
+        if self.directory is None:
+            return None
+        file = self._file(key)
+        try:
+            with np.load(file, allow_pickle=False) as data:
+                arrays = dict(data)
+        except Exception:
+            return None
+        try:
+            os.utime(file)  # modification time marks the recently used files
+        except OSError:
+            pass
+        return arrays
+
+    def put(self, key, arrays: dict[str, np.ndarray]):
+        """Store arrays atomically, i.e. other processes never read partially written file."""
+        if self.directory is None:
+            return
+        tmp = None
+        try:
+            Path(self.directory).mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.directory, suffix='.tmp', delete=False) as f:
+                tmp = f.name
+                np.savez(f, **arrays)
+            os.replace(tmp, self._file(key))
+            self._prune()
+        except Exception:
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _prune(self):
+        """Remove the least recently used files until the total size of the cache files is within the limit."""
+        files = []
+        for f in Path(self.directory).glob('*.npz'):
+            try:
+                stat = f.stat()
+            except OSError:  # removed by other process
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, f))
+        nbytes = sum(size for _, size, _ in files)
+        for _, size, f in sorted(files):
+            if nbytes <= self.max_bytes:
+                break
+            try:
+                f.unlink()
+            except OSError:
+                pass
+            nbytes -= size
+
+    def clear(self):
+        """Remove all the cached files."""
+        if self.directory is not None and Path(self.directory).is_dir():
+            for f in Path(self.directory).glob('*.npz'):
+                f.unlink()
+
+
+"Process-wide cache of the meshcat geometries and textures created from mesh files, shared by all objects and robots"
+geometry_cache = LRUCache(max_bytes=512 * 2**20)
+
+"Process-wide cache of the textures encoded from the images of mesh materials, indexed by the hash of the image"
+texture_cache = LRUCache(max_bytes=128 * 2**20)
+
+"Persistent cache of the geometries and textures created from mesh files, shared by all processes"
+disk_cache = DiskCache(default_cache_directory())
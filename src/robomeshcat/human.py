@@ -78,14 +78,12 @@ class Human(Object):
         if morph_id is not None:
             self._morph_target_influences[morph_id] = 1
 
-    def _set_morph_property(self):
+    def _animation_properties(self) -> dict:
         if self._morph_target_influences is None:
             self._morph_target_influences = [0] * len(self._geometry.morph_positions)
-        self._set_property('morphTargetInfluences', self._morph_target_influences, 'vector')
-
-    def _reset_all_properties(self):
-        super()._reset_all_properties()
-        self._set_morph_property()
+        properties = super()._animation_properties()
+        properties['morphTargetInfluences'] = (list(self._morph_target_influences), 'vector', '<object>')
+        return properties
 
 
 class TriangularMeshGeometryWithMorphAttributes(g.TriangularMeshGeometry):
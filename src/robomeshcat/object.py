@@ -7,6 +7,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import itertools
 from pathlib import Path
 import trimesh
@@ -16,6 +17,8 @@ import io
 import meshcat.geometry as g
 from meshcat.animation import AnimationFrameVisualizer
 
+from .cache import disk_cache, file_cache_key, file_hash, geometry_cache, texture_cache
+
 
 class Object:
     """Represent an object with arbitrary geometry that can be rendered in the meshcat."""
@@ -43,6 +46,13 @@ class Object:
         super().__init__()
         self.name = f'obj{next(self.id_iterator)}' if name is None else name
         self._vis = None  # either a visualization tree or the frame of the animation, is set by the scene
+        self._deferred = False  # if true, transformation is sent only when flushed by the scene, is set by the scene
+        self._transform_dirty = False
+        self._sent_pose = None  # the last pose sent to the meshcat, used to skip sending of unchanged poses
+
+        "Pose is not sent if it differs from the last sent pose less than these tolerances [m] and [rad]"
+        self.pos_tolerance = 0.0
+        self.rot_tolerance = 0.0
 
         "List of properties that could be updated for all objects"
         self._pose = ArrayWithCallbackOnSetItem(np.eye(4) if pose is None else pose, cb=self._set_transform)
@@ -79,25 +89,55 @@ class Object:
         """Create an object in meshcat and set all the initial properties."""
         self._assert_vis()
         self._vis.set_object(self._geometry, self._material)
-        self._set_transform()
+        self._send_transform(force=True)
 
     def _delete_object(self):
         """Delete an object from meshcat."""
         self._vis.delete()
 
     def _set_transform(self):
-        """Update transformation in the meshcat."""
+        """Update transformation in the meshcat. In deferred mode, the object is only marked dirty and the
+        transformation is sent by the :func:`_flush` method. In the animation, the pose is recorded by the scene on
+        render."""
         self._assert_vis()
-        self._vis.set_transform(self._pose)
+        if self._is_animation():
+            return
+        if self._deferred:
+            self._transform_dirty = True
+            return
+        self._send_transform()
 
-    def _set_property(self, key, value, prop_type='number', subpath='<object>'):
-        """Set property of the object, handle animation frames set_property internally."""
+    def _flush(self):
+        """Send the transformation postponed in the deferred mode, if there is any."""
+        if self._transform_dirty:
+            self._send_transform()
+
+    def _send_transform(self, force: bool = False):
+        """Send the transformation unless it is within the tolerances from the last sent one."""
+        self._transform_dirty = False
+        if not force and self._is_pose_sent():
+            return
+        self._vis.set_transform(self._pose)
+        self._sent_pose = np.array(self._pose)
+
+    def _is_pose_sent(self) -> bool:
+        """Return true if the current pose is within the tolerances from the last sent pose."""
+        if self._sent_pose is None:
+            return False
+        if self.pos_tolerance <= 0 and self.rot_tolerance <= 0:
+            return np.array_equal(self._pose, self._sent_pose)
+        if np.linalg.norm(self._pose[:3, 3] - self._sent_pose[:3, 3]) > self.pos_tolerance:
+            return False
+        cos_angle = (np.trace(self._sent_pose[:3, :3].T @ self._pose[:3, :3]) - 1) / 2
+        return np.arccos(np.clip(cos_angle, -1.0, 1.0)) <= self.rot_tolerance
+
+    def _set_property(self, key, value, subpath='<object>'):
+        """Set property of the object online. In the animation, properties are recorded by the scene on render."""
         self._assert_vis()
-        element = self._vis if subpath is None else self._vis[subpath]
         if self._is_animation():
-            element.set_property(key, prop_type, value)
-        else:
-            element.set_property(key, value)
+            return
+        element = self._vis if subpath is None else self._vis[subpath]
+        element.set_property(key, value)
 
     def _is_animation(self):
         """Return true if rendering to the animation. Used internally to modify the way of assigning properties until
@@ -151,7 +191,7 @@ class Object:
     @visible.setter
     def visible(self, v):
         self._visible = bool(v)
-        self._set_property('visible', value=self._visible, prop_type='boolean')
+        self._set_property('visible', value=self._visible)
 
     def hide(self):
         self.visible = False
@@ -168,9 +208,7 @@ class Object:
     @opacity.setter
     def opacity(self, v):
         self._opacity = v
-        if self._is_animation():
-            self._set_property('material.opacity', value=self._opacity, prop_type='number')
-        else:
+        if not self._is_animation():
             self._set_object()  # only way how to update opacity online is to reset the object
 
     @property
@@ -182,18 +220,18 @@ class Object:
         self._color[:] = self._color_from_input(v)
 
     def _color_reset_on_set_item(self):
-        if self._is_animation():
-            self._set_property('material.color', value=self.color.tolist(), prop_type='vector')
-        else:
+        if not self._is_animation():
             self._set_object()  # only way how to update color online is to reset the object
 
-    def _reset_all_properties(self):
-        """Reset all properties in the meshcat, i.e. call setters with the same variable. Useful for the animation
-        frames."""
-        self.pose = self.pose
-        self.color = self.color
-        self.opacity = self.opacity
-        self.visible = self.visible
+    def _animation_properties(self) -> dict:
+        """Return properties recorded into the animation frames as a dictionary: name -> (value, type, subpath), where
+        type None stands for the pose of the object."""
+        return {
+            'pose': (np.array(self._pose), None, None),
+            'material.color': (self.color.tolist(), 'vector', '<object>'),
+            'material.opacity': (self.opacity, 'number', '<object>'),
+            'visible': (self.visible, 'boolean', '<object>'),
+        }
 
     """=== Helper functions to create basic primitives ==="""
 
@@ -239,8 +277,7 @@ class Object:
         that is common in robotics. To achieve that, we create a mesh of a cylinder instead of using meshcat cylinder
         that is aligned with y-axis."""
         mesh: trimesh.Trimesh = trimesh.creation.cylinder(radius=radius, height=length, sections=50)
-        exp_obj = trimesh.exchange.obj.export_obj(mesh)
-        mesh = g.ObjMeshGeometry.from_stream(trimesh.util.wrap_as_stream(exp_obj))
+        mesh = TriangularMeshGeometryWithAttributes.from_trimesh(mesh)
         return cls(mesh, pose=pose, color=color, texture=texture, opacity=opacity, name=name)
 
     @classmethod
@@ -255,7 +292,67 @@ class Object:
         name: str | None = None,
     ):
         """Create a mesh object by loading it from the :param path_to_mesh. Loading is performed by 'trimesh' library
-        internally."""
+        internally. Loaded geometries (and textures) are stored in the process-wide cache, so that the same file is not
+        loaded again unless it is modified, and in the persistent disk cache (see :mod:`robomeshcat.cache`), so that
+        the file is not processed again in other processes."""
+        scale_key = tuple(np.atleast_1d(np.asarray(scale, dtype=float)).tolist())
+        geometry, mesh_texture, mesh_color = geometry_cache.get_or_create(
+            file_cache_key(path_to_mesh, scale_key, texture is None),
+            lambda: cls._load_mesh_cached(path_to_mesh, scale, load_texture=texture is None),
+        )
+        return cls(
+            geometry,
+            pose=pose,
+            color=mesh_color if mesh_color is not None else color,
+            texture=texture if texture is not None else mesh_texture,
+            opacity=opacity,
+            name=name,
+        )
+
+    @classmethod
+    def _load_mesh_cached(cls, path_to_mesh: str | Path, scale: float | list[float] = 1.0, load_texture: bool = True):
+        """Load the mesh geometry, texture and color from the disk cache. If it is not cached, load it from the file
+        and store it into the cache."""
+        key = (file_hash(path_to_mesh), tuple(np.atleast_1d(np.asarray(scale, dtype=float)).tolist()), load_texture)
+        arrays = disk_cache.get(key)
+        if arrays is not None:
+            return cls._mesh_from_arrays(arrays)
+        geometry, texture, color = cls._load_mesh(path_to_mesh, scale=scale, load_texture=load_texture)
+        disk_cache.put(key, cls._mesh_to_arrays(geometry, texture, color))
+        return geometry, texture, color
+
+    @staticmethod
+    def _mesh_to_arrays(
+        geometry: TriangularMeshGeometryWithAttributes, texture: g.ImageTexture | None, color: np.ndarray | None
+    ) -> dict[str, np.ndarray]:
+        """Represent the loaded mesh geometry, texture and color by arrays stored in the disk cache."""
+        arrays = dict(vertices=geometry.vertices, faces=geometry.faces)
+        if geometry.normals is not None:
+            arrays['normals'] = geometry.normals
+        if geometry.uvs is not None:
+            arrays['uvs'] = geometry.uvs
+        if texture is not None:
+            arrays['png'] = np.frombuffer(texture.image.data, dtype=np.uint8)
+        if color is not None:
+            arrays['color'] = color
+        return arrays
+
+    @staticmethod
+    def _mesh_from_arrays(
+        arrays: dict[str, np.ndarray],
+    ) -> tuple[TriangularMeshGeometryWithAttributes, g.ImageTexture | None, np.ndarray | None]:
+        """Inverse of :func:`_mesh_to_arrays`."""
+        geometry = TriangularMeshGeometryWithAttributes(
+            arrays['vertices'], arrays['faces'], normals=arrays.get('normals'), uvs=arrays.get('uvs')
+        )
+        texture = g.ImageTexture(g.PngImage(arrays['png'].tobytes())) if 'png' in arrays else None
+        return geometry, texture, arrays.get('color')
+
+    @staticmethod
+    def _load_mesh(path_to_mesh: str | Path, scale: float | list[float] = 1.0, load_texture: bool = True):
+        """Load the mesh from the file and convert it into the meshcat geometry, the texture and the color of the
+        mesh material. Texture is None unless the material has an image, color is None unless the material has a
+        uniform color; both are None if the mesh has no material or :param load_texture is false."""
         try:
             mesh: trimesh.Trimesh = trimesh.load(path_to_mesh, force='mesh')
         except ValueError as e:
@@ -276,42 +373,103 @@ class Object:
 
         mesh.apply_scale(scale)
 
-        try:  # try to get texture from the mesh
-            if hasattr(mesh, 'visual') and hasattr(mesh.visual, 'material') and texture is None:
-                n = 100
+        texture, color = None, None
+        material = getattr(getattr(mesh, 'visual', None), 'material', None)
+        if material is not None and load_texture:
+            image = getattr(material, 'baseColorTexture', getattr(material, 'image', None))
+            if image is not None:
+                texture = _texture_from_image(image)
+            else:
+                if isinstance(material, trimesh.visual.material.SimpleMaterial):
+                    data = material.diffuse  # e.g. Kd of the obj material
+                else:
+                    data = material.to_color(np.zeros((1, 2)))  # uniform color of the material if it has any
+                if data is not None:
+                    color = np.asarray(data, dtype=float).reshape(-1)[:3] / 255
 
-                def xy_to_uv(xy, w=n, h=n):
-                    u = xy[..., 0] / (w - 1)
-                    v = 1 - xy[..., 1] / (h - 1)
-                    return np.stack((u, v), axis=-1)
+        with_uvs = texture is not None or not load_texture  # user texture (not loaded from the mesh) needs uvs too
+        geometry = TriangularMeshGeometryWithAttributes.from_trimesh(mesh, with_uvs=with_uvs)
+        return geometry, texture, color
 
-                X, Y = np.meshgrid(np.arange(n), np.arange(n))
-                uv = xy_to_uv(np.stack((X, Y), axis=-1))
-                data = mesh.visual.material.to_color(uv.reshape(-1, 2))
-                if data.shape == (4,):
-                    data = np.tile(data, n * n).reshape(n, n, 4)
-                else:
-                    data = data.reshape(n, n, 4)
-                b = io.BytesIO()
-                Image.fromarray(data).save(b, 'png')
-                texture = g.ImageTexture(g.PngImage(b.getvalue()))
-        except Exception:
-            pass
 
-        try:
-            exp_obj = trimesh.exchange.obj.export_obj(mesh)
-        except ValueError:
-            exp_obj = trimesh.exchange.obj.export_obj(mesh, include_texture=False)
+def _texture_from_image(image: Image.Image) -> g.ImageTexture:
+    """Create texture from the image of the mesh material. Encoded textures are cached by the hash of the image
+    content, so the image shared by multiple meshes is encoded only once."""
+    key = hashlib.sha256(image.tobytes()).hexdigest(), image.mode, image.size
+
+    def encode():
+        b = io.BytesIO()
+        (image if image.mode in ('RGB', 'RGBA', 'L', 'LA') else image.convert('RGBA')).save(b, 'png')
+        return g.ImageTexture(g.PngImage(b.getvalue()))
+
+    return texture_cache.get_or_create(key, encode)
 
+
+def _normalized(v: np.ndarray) -> np.ndarray:
+    """Normalize rows of the array, zero rows are kept zero."""
+    norm = np.linalg.norm(v, axis=-1, keepdims=True)
+    return v / np.where(norm > 0, norm, 1.0)
+
+
+class TriangularMeshGeometryWithAttributes(g.TriangularMeshGeometry):
+    """Triangular mesh sent to the meshcat as packed binary buffers, extended by optional vertex normals and texture
+    coordinates. It replaces the OBJ text representation that is expensive to format and to parse in the browser."""
+
+    def __init__(self, vertices, faces, normals=None, uvs=None, color=None):
+        super(TriangularMeshGeometryWithAttributes, self).__init__(vertices=vertices, faces=faces, color=color)
+        self.normals = None if normals is None else np.asarray(normals, dtype=np.float32)
+        self.uvs = None if uvs is None else np.asarray(uvs, dtype=np.float32)
+
+    @classmethod
+    def from_trimesh(cls, mesh: trimesh.Trimesh, crease_angle: float = np.deg2rad(30), with_uvs: bool = True):
+        """Create geometry from the trimesh mesh. Vertex normals are computed so that the mesh is smooth shaded except
+        of the edges sharper than the :param crease_angle [rad], where the vertices are split. Texture coordinates are
+        skipped if not :param with_uvs, e.g. if the mesh has no texture."""
+        uv = getattr(mesh.visual, 'uv', None) if with_uvs else None
+        if uv is not None and len(uv) != len(mesh.vertices):
+            uv = None
+        vertices, faces = np.asarray(mesh.vertices, dtype=float), np.asarray(mesh.faces)
+        face_normals = np.cross(
+            vertices[faces[:, 1]] - vertices[faces[:, 0]], vertices[faces[:, 2]] - vertices[faces[:, 0]]
+        )
+        vertex_normals = np.zeros_like(vertices)
+        np.add.at(vertex_normals, faces.reshape(-1), np.repeat(face_normals, 3, axis=0))  # area weighted
+        face_normals = _normalized(face_normals)
+        vertex_normals = _normalized(vertex_normals)
+
+        "Vertex is sharp if the normal of any of its faces deviates from the vertex normal more than the crease angle"
+        corner_vertices, corner_normals = faces.reshape(-1), np.repeat(face_normals, 3, axis=0)
+        cos = np.sum(corner_normals * vertex_normals[corner_vertices], axis=-1)
+        sharp = np.zeros(len(vertices), dtype=bool)
+        sharp[corner_vertices[cos < np.cos(crease_angle)]] = True
+
+        "Corners of smooth vertex share single vertex, corners of sharp vertex are split by the normal of their face"
+        corner_sharp = sharp[corner_vertices]
+        smooth_vertices = np.flatnonzero(~sharp)
+        index = np.zeros(len(vertices), dtype=int)
+        index[smooth_vertices] = np.arange(len(smooth_vertices))
+        new_faces = index[corner_vertices]
+        keys = np.column_stack([corner_vertices[corner_sharp], np.round(corner_normals[corner_sharp], 6)])
+        _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        new_faces[corner_sharp] = len(smooth_vertices) + inverse.reshape(-1)
+        sharp_vertices = corner_vertices[corner_sharp][first]
+        new_vertices = np.concatenate([smooth_vertices, sharp_vertices])
+        normals = np.concatenate([vertex_normals[smooth_vertices], corner_normals[corner_sharp][first]])
         return cls(
-            g.ObjMeshGeometry.from_stream(trimesh.util.wrap_as_stream(exp_obj)),
-            pose=pose,
-            color=color,
-            texture=texture,
-            opacity=opacity,
-            name=name,
+            vertices[new_vertices],
+            new_faces.reshape(-1, 3),
+            normals=normals,
+            uvs=None if uv is None else np.asarray(uv)[new_vertices],
         )
 
+    def lower(self, object_data):
+        ret = super(TriangularMeshGeometryWithAttributes, self).lower(object_data=object_data)
+        if self.normals is not None:
+            ret[u"data"][u"attributes"][u"normal"] = g.pack_numpy_array(self.normals.T)
+        if self.uvs is not None:
+            ret[u"data"][u"attributes"][u"uv"] = g.pack_numpy_array(self.uvs.T)
+        return ret
+
 
 class ArrayWithCallbackOnSetItem(np.ndarray):
     def __new__(cls, input_array, cb=None):
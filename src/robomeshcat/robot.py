@@ -7,6 +7,7 @@
 from __future__ import annotations
 
 import itertools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
@@ -31,6 +32,10 @@ class Robot:
         color: list[float] | None = None,
         opacity: float | None = None,
         pose=None,
+        lazy_fk: bool = False,
+        pos_tolerance: float = 0.0,
+        rot_tolerance: float = 0.0,
+        load_workers: int | None = None,
     ) -> None:
         """
         Create a robot using pinocchio loader, you have to option to create a robot: (i) using URDF or
@@ -45,6 +50,12 @@ class Robot:
         :param name: name of the robot used in meshcat tree
         :param color: optional color that overwrites one from the urdf
         :param opacity: optional opacity that overwrites one from the urdf
+        :param lazy_fk: if true, modification of the configuration or the base pose only marks the robot as changed and
+          forward kinematics is computed once in the scene render
+        :param pos_tolerance, rot_tolerance: link pose is not sent to the meshcat if it differs from the last sent pose
+          less than the given position [m] and rotation [rad] tolerances; unchanged poses are never sent
+        :param load_workers: number of threads used to load the meshes of the links in parallel, default number of
+          threads of the ThreadPoolExecutor is used if None; meshes are loaded sequentially if it is 1
         """
         super().__init__()
         self.name = f'robot{next(self.id_iterator)}' if name is None else name
@@ -63,16 +74,38 @@ class Robot:
             self._model, self._data = pinocchio_model, pinocchio_data
             self._geom_model, self._geom_data = pinocchio_geometry_model, pinocchio_geometry_data
 
+        self._lazy_fk = lazy_fk
+        self._fk_stale = False
+
         """ Adjustable properties """
-        self._pose = ArrayWithCallbackOnSetItem(np.eye(4) if pose is None else pose, cb=self._fk)
-        self._q = ArrayWithCallbackOnSetItem(pin.neutral(self._model), cb=self._fk)
+        self._pose = ArrayWithCallbackOnSetItem(np.eye(4) if pose is None else pose, cb=self._request_fk)
+        self._q = ArrayWithCallbackOnSetItem(pin.neutral(self._model), cb=self._request_fk)
         self._color = ArrayWithCallbackOnSetItem(Object._color_from_input(color), cb=self._color_reset_on_set_item)
         self._opacity = opacity
         self._visible = True
 
         """Set of objects used to visualize the links."""
         self._objects: dict[str, Object] = {}
-        self._init_objects(overwrite_color=color is not None)
+        self._init_objects(overwrite_color=color is not None, load_workers=load_workers)
+        for o in self._objects.values():
+            o.pos_tolerance, o.rot_tolerance = pos_tolerance, rot_tolerance
+
+        """Index of the configuration vector for each joint name, slice is used for joints with more than one nq."""
+        self._joint_q_index: dict[str, int | slice] = {}
+        self._q_indices = np.arange(self._model.nq)
+        for jid in range(1, self._model.njoints):
+            idx_q, nq = self._model.idx_qs[jid], self._model.nqs[jid]
+            if nq > 0:
+                self._joint_q_index[self._model.names[jid]] = idx_q if nq == 1 else slice(idx_q, idx_q + nq)
+
+        """Kinematic structure used to update only the links affected by the changed joints."""
+        self._fk_q = np.array(self._q)  # configuration and base pose for which the objects poses were computed
+        self._fk_pose = np.array(self._pose)
+        self._q_joint_ids = np.zeros(self._model.nq, dtype=int)
+        for jid in range(1, self._model.njoints):
+            self._q_joint_ids[self._model.idx_qs[jid] + np.arange(self._model.nqs[jid])] = jid
+        self._subtrees = [np.asarray(subtree, dtype=int) for subtree in self._model.subtrees]
+        self._geom_parent_joints = np.array([g.parentJoint for g in self._geom_model.geometryObjects], dtype=int)
 
     @staticmethod
     def _build_model_from_urdf(
@@ -92,19 +125,77 @@ class Robot:
         geom_data: pin.GeometryData = col_data if show_collision_models else vis_data
         return model, data, geom_model, geom_data
 
+    def _request_fk(self):
+        """Compute forward kinematics immediately or only mark the robot as changed in the lazy mode."""
+        if self._lazy_fk:
+            self._fk_stale = True
+        else:
+            self._fk()
+
+    def _flush(self):
+        """Compute forward kinematics postponed in the lazy mode, if there is any."""
+        if self._fk_stale:
+            self._fk()
+
     def _fk(self):
-        """Compute ForwardKinematics and update the objects poses."""
+        """Compute ForwardKinematics and update poses of the objects attached to the subtrees of the changed joints."""
+        self._fk_stale = False
+        geometry_ids = self._affected_geometry_ids()
+        self._fk_q[:] = self._q
+        self._fk_pose[:] = self._pose
+        if len(geometry_ids) == 0:
+            return
         pin.forwardKinematics(self._model, self._data, self._q)
         pin.updateGeometryPlacements(self._model, self._data, self._geom_model, self._geom_data)
         base = pin.SE3(self._pose)
-        for g, f in zip(self._geom_model.geometryObjects, self._geom_data.oMg):
-            self._objects[f'{self.name}/{g.name}'].pose = (base * f).homogeneous
+        for i in geometry_ids.tolist():
+            g = self._geom_model.geometryObjects[i]
+            self._objects[f'{self.name}/{g.name}'].pose = (base * self._geom_data.oMg[i]).homogeneous
+
+    def _affected_geometry_ids(self):
+        """Return indices of the geometry objects whose poses changed since the last forward kinematics, i.e. all
+        objects if the base pose changed or objects attached to the kinematic subtrees of the changed joints."""
+        if not np.array_equal(self._pose, self._fk_pose):
+            return np.arange(len(self._geom_parent_joints))
+        changed_joints = np.unique(self._q_joint_ids[self._q != self._fk_q])
+        affected = np.zeros(self._model.njoints, dtype=bool)
+        for jid in changed_joints:
+            affected[self._subtrees[jid]] = True
+        return np.flatnonzero(affected[self._geom_parent_joints])
+
+    def compute_link_poses(self, q_trajectory, pose=None) -> np.ndarray:
+        """Compute poses of all objects of the robot for each configuration of the trajectory without modifying the
+        robot state.
+        :param q_trajectory: array of configurations of the shape (T, nq)
+        :param pose: base pose of the robot, either a single 4x4 pose or an array of the shape (T, 4, 4); the current
+          base pose is used by default
+        :return: array of the shape (T, number of objects, 4, 4) with objects ordered as in :func:`link_names`
+        """
+        q_trajectory = np.asarray(q_trajectory, dtype=float).reshape(-1, self._model.nq)
+        data = self._model.createData()
+        joint_ids = np.unique(self._geom_parent_joints)
+        joint_poses = np.empty((q_trajectory.shape[0], self._model.njoints, 4, 4))
+        for t, q in enumerate(q_trajectory):
+            pin.forwardKinematics(self._model, data, q)
+            for jid in joint_ids.tolist():
+                joint_poses[t, jid] = data.oMi[jid].homogeneous
+        placements = np.array([g.placement.homogeneous for g in self._geom_model.geometryObjects]).reshape(-1, 4, 4)
+        poses = joint_poses[:, self._geom_parent_joints] @ placements
+        base = np.asarray(self._pose if pose is None else pose, dtype=float).reshape(-1, 1, 4, 4)
+        return base @ poses
 
-    def _init_objects(self, overwrite_color=False):
-        """Fill in objects dictionary based on the data from pinocchio"""
+    @property
+    def link_names(self) -> list[str]:
+        """Names of the objects used to visualize the links, in the order of the pinocchio geometry model."""
+        return [f'{self.name}/{g.name}' for g in self._geom_model.geometryObjects]
+
+    def _init_objects(self, overwrite_color=False, load_workers: int | None = None):
+        """Fill in objects dictionary based on the data from pinocchio. Objects are created in parallel by the pool of
+        :param load_workers threads, as the loading of meshes is dominated by file reading and parsing."""
         pin.forwardKinematics(self._model, self._data, self._q)
         pin.updateGeometryPlacements(self._model, self._data, self._geom_model, self._geom_data)
         base = pin.SE3(self._pose)
+        creators = []
         for g, f in zip(self._geom_model.geometryObjects, self._geom_data.oMg):
             kwargs = dict(
                 name=f'{self.name}/{g.name}',
@@ -114,14 +205,24 @@ class Robot:
                 pose=(base * f).homogeneous,
             )
             if g.meshPath == 'BOX':
-                self._objects[kwargs['name']] = Object.create_cuboid(lengths=2 * g.geometry.halfSide, **kwargs)
+                kwargs.update(lengths=2 * g.geometry.halfSide)
+                creators.append((Object.create_cuboid, kwargs))
             elif g.meshPath == 'SPHERE':
-                self._objects[kwargs['name']] = Object.create_sphere(radius=g.geometry.radius, **kwargs)
+                kwargs.update(radius=g.geometry.radius)
+                creators.append((Object.create_sphere, kwargs))
             elif g.meshPath == 'CYLINDER':
-                radius, length = g.geometry.radius, 2 * g.geometry.halfLength
-                self._objects[kwargs['name']] = Object.create_cylinder(radius=radius, length=length, **kwargs)
+                kwargs.update(radius=g.geometry.radius, length=2 * g.geometry.halfLength)
+                creators.append((Object.create_cylinder, kwargs))
             else:
-                self._objects[kwargs['name']] = Object.create_mesh(path_to_mesh=g.meshPath, scale=g.meshScale, **kwargs)
+                kwargs.update(path_to_mesh=g.meshPath, scale=g.meshScale)
+                creators.append((Object.create_mesh, kwargs))
+        if load_workers == 1 or len(creators) < 2:
+            objects = [create(**kwargs) for create, kwargs in creators]
+        else:
+            with ThreadPoolExecutor(max_workers=load_workers, thread_name_prefix='robomeshcat-load') as pool:
+                objects = list(pool.map(lambda c: c[0](**c[1]), creators))
+        for o in objects:
+            self._objects[o.name] = o
 
     """ === Methods for adjusting the base pose of the robot. ==="""
 
@@ -149,19 +250,16 @@ class Robot:
     def rot(self, r):
         self._pose[:3, :3] = r
 
-    def _get_joint_id(self, key: str | int):
-        """Get the joint id either from joint name or integer. The universe joint is
-        not counted as we assume it is fixed."""
-        if isinstance(key, int):
-            return key
-        jid = self._model.getJointId(key)
-        # there is often universe joint that is not counted, so we need to adjust the
-        # index
-        if len(self._model.names) == len(self._q) + 1:
-            jid -= 1
-        if jid == self._model.nq:
-            raise KeyError(f'Joint {key} not found.')
-        return jid
+    def _get_joint_id(self, key: str | int | list[str] | list[int]):
+        """Get the index of the configuration vector either from joint name, list of joint names or integer. Joints
+        with more than one configuration value (e.g. free flyer) are indexed by slice."""
+        if isinstance(key, str):
+            if key not in self._joint_q_index:
+                raise KeyError(f'Joint {key} not found.')
+            return self._joint_q_index[key]
+        if isinstance(key, (list, tuple)):
+            return np.concatenate([self._q_indices[self._get_joint_id(k)].reshape(-1) for k in key])
+        return key
 
     def __getitem__(self, key):
         return self._q[self._get_joint_id(key)]
@@ -169,6 +267,29 @@ class Robot:
     def __setitem__(self, key, value):
         self._q[self._get_joint_id(key)] = value
 
+    def set_q(self, q):
+        """Set the configuration of the robot and compute forward kinematics only once.
+        :param q: either the full configuration vector or dictionary joint name/index -> value
+        """
+        self.update(q=q)
+
+    def update(self, q=None, pose=None):
+        """Update the configuration and/or the base pose of the robot and compute forward kinematics only once (or mark
+        the robot as changed in the lazy mode).
+        :param q: either the full configuration vector or dictionary joint name/index -> value
+        :param pose: 4x4 base pose of the robot
+        """
+        if q is not None:
+            q_array = self._q.view(np.ndarray)  # view without callback, i.e. FK is not computed on assignment
+            if isinstance(q, dict):
+                for k, v in q.items():
+                    q_array[self._get_joint_id(k)] = v
+            else:
+                q_array[:] = q
+        if pose is not None:
+            self._pose.view(np.ndarray)[:, :] = pose
+        self._request_fk()
+
     """=== Control of the object visibility ==="""
 
     @property
@@ -7,32 +7,64 @@
 from __future__ import annotations
 
 import itertools
+import json
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tempfile import gettempdir
 
 import imageio
 import numpy as np
+import umsgpack
 from PIL.Image import Image
 
 import meshcat
-from meshcat.animation import Animation, AnimationFrameVisualizer
+import meshcat.geometry as g
+from meshcat.animation import Animation, AnimationClip, AnimationFrameVisualizer, AnimationTrack
+from meshcat.commands import SetObject
+from meshcat.path import Path as MeshcatPath
 
 from .object import Object, ArrayWithCallbackOnSetItem
 from .robot import Robot
+from .sender import CommandSender
 
 
 class Scene:
-    def __init__(self, open: bool = True, wait_for_open: bool = True) -> None:
+    def __init__(
+        self,
+        open: bool = True,
+        wait_for_open: bool = True,
+        deferred: bool = False,
+        async_send: bool = False,
+        queue_size: int = 1000,
+        queue_policy: str = 'coalesce',
+    ) -> None:
+        """Create a scene that renders objects and robots in the meshcat.
+        :param open: whether to open the visualizer in the browser
+        :param wait_for_open: whether to wait until the browser is connected
+        :param deferred: if true, changes of the objects poses are not sent immediately but only the last pose of each
+            modified object is sent when :func:`render` is called
+        :param async_send: if true, commands are sent to meshcat from the background thread, so that the caller is not
+            blocked until the meshcat server replies
+        :param queue_size: maximum number of commands waiting to be sent in the async mode
+        :param queue_policy: queueing behaviour, one of 'block', 'drop_oldest', or 'coalesce' (default) that keeps only
+            the newest queued pose/property update of each object and camera; see :class:`CommandSender` for details
+        """
         super().__init__()
         self.objects: dict[str, Object] = {}
         self.robots: dict[str, Robot] = {}
+        self._deferred = deferred
+        self._batch_depth = 0
 
         self.vis = meshcat.Visualizer()
         if open:
             self.vis.open()
         if wait_for_open:
             self.vis.wait()
+        self._sender = CommandSender(self.vis.window, async_send=async_send, queue_size=queue_size, policy=queue_policy)
+        self.vis.window = self._sender
         self.set_background_color()
 
         "Variables used to control the camera"
@@ -45,9 +77,11 @@ class Scene:
         self._animation: Animation | None = None
         self._animation_frame: AnimationFrameVisualizer | None = None
         self._animation_frame_counter: itertools.count | None = None
+        self._animation_recorded: dict[str, dict] = {}  # name -> property -> (value, frame) of the last keyframe
+        self._animation_context: AnimationContext | None = None
 
         " Variables used internally to write frames of the video "
-        self._video_writer = None
+        self._video_context: VideoContext | None = None
 
     def add_object(self, obj: Object, verbose: bool = True):
         if verbose and obj.name in self.objects:
@@ -60,6 +94,7 @@ class Scene:
             return
         self.objects[obj.name] = obj
         obj._set_vis(self.vis)
+        obj._deferred = self.deferred
         obj._set_object()
 
     def remove_object(self, obj: Object, verbose: bool = True):
@@ -84,13 +119,56 @@ class Scene:
         for obj in robot._objects.values():
             self.remove_object(obj, verbose=verbose)
 
+    @property
+    def deferred(self):
+        return self._deferred or self._batch_depth > 0
+
+    @deferred.setter
+    def deferred(self, v):
+        self._deferred = bool(v)
+        self._update_objects_deferred()
+
+    def _update_objects_deferred(self):
+        """Propagate deferred mode to all objects and send the postponed changes if the mode was disabled."""
+        for o in self.objects.values():
+            o._deferred = self.deferred
+        if not self.deferred:
+            self._flush()
+
+    def batch(self):
+        """Return a context manager that postpones sending of the objects poses until the end of the context, where
+        only the last pose of each modified object is sent.
+        Usage:
+            with scene.batch():
+                for o in objects:
+                    o.pos[0] += 0.1
+                    o.pos[1] += 0.1
+        """
+        return BatchContext(scene=self)
+
+    def _flush(self):
+        """Compute forward kinematics of lazy robots and send all changes postponed in the deferred mode to the
+        meshcat."""
+        for r in self.robots.values():
+            r._flush()
+        for o in self.objects.values():
+            o._flush()
+
     def render(self):
         """Render current scene either to browser, video or to the next frame of the animation."""
+        self._flush()
         if self._animation is not None:
-            self._reset_all_properties()
-            self._next_animation_frame()
-        if self._video_writer is not None:
-            self._video_writer.append_data(np.array(self.render_image()))
+            self._record_animation_frame(last=self._animation_context._is_chunk_complete())
+            self._animation_context._next_frame()
+        if self._video_context is not None:
+            self._capture_video_frame()
+
+    def _capture_video_frame(self):
+        """Capture the image into the video. The last captured image is reused if no command was sent to the meshcat
+        since it was captured."""
+        if self._sender.modified or not self._video_context.repeat_last_image():
+            self._sender.modified = False
+            self._video_context.append_image(self.render_image())
 
     #
     def video_recording(
@@ -101,6 +179,8 @@ class Scene:
          1) filename parameter if it is not None
          2) directory/timestemp.mp4 if filename is None and directory is not None
          3) /tmp/timestemp if filename is None and directory is None
+        Captured images are converted and encoded in the background threads, the number of conversion threads and the
+        maximum number of frames waiting for encoding can be set by 'workers' and 'queue_size' keyword arguments.
         """
         if filename is None:
             if directory is None:
@@ -111,6 +191,19 @@ class Scene:
     def render_image(self) -> Image:
         return self.vis.get_image()
 
+    def sync(self):
+        """Block until all commands are sent to the meshcat. Useful in the async mode, e.g. before exiting the
+        program."""
+        self._flush()
+        self._sender.flush()
+
+    def close(self):
+        """Send all queued commands and stop the background sender thread of the async mode. The scene can still be
+        used afterwards, the commands are sent synchronously then. It is called automatically at the interpreter
+        exit."""
+        self._flush()
+        self._sender.close()
+
     def __getitem__(self, item):
         return self.objects[item] if item in self.objects else self.robots[item]
 
@@ -130,15 +223,183 @@ class Scene:
 
     """=== The following set of functions handle animations ==="""
 
-    def animation(self, fps: int = 30):
+    def animation(
+        self,
+        fps: int = 30,
+        tolerance: float | tuple[float, float] | None = None,
+        chunk_duration: float | None = None,
+        chunk_directory: Path | str | None = None,
+    ):
         """Return context of the animation that allow us to record animations.
         Usage:
             with scene.animation(fps=30):
                 scene['obj'].pos = 3. # set properties of a first frame
                 scene.render() # create a second frame of animation
                 scene['obj'].pos = 3.
+        :param tolerance: if set, keyframes of poses that can be reconstructed by the interpolation of the neighbouring
+            keyframes are removed; either a single value used for both position [m] and rotation [rad] or a tuple of
+            position and rotation tolerances
+        :param chunk_duration: if set, the animation is published to the viewer in chunks of the given duration [s]
+            while recording, so that long recordings are neither kept in memory nor sent in a single message; each
+            chunk starts with the full state of the scene and replaces the previous chunk in the viewer, i.e. the viewer
+            serves as a live preview and only the last chunk is kept in the context
+        :param chunk_directory: if set, each published chunk is saved by :func:`save_animation` into this directory
+            as chunk_000000.npz, chunk_000001.npz, ...; the whole recording is replayed by passing the directory to
+            :func:`load_animation`
+        """
+        return AnimationContext(
+            scene=self, fps=fps, tolerance=tolerance, chunk_duration=chunk_duration, chunk_directory=chunk_directory
+        )
+
+    def animate_trajectory(
+        self, robot: Robot, q_trajectory, fps: int = 30, times=None, play: bool = True, repetitions: int = 1
+    ) -> Animation:
+        """Create and publish the animation of the robot following the joint trajectory. Unlike the :func:`animation`
+        context, keyframes of all links are computed at once from the arrays of link poses.
+        :param robot: robot that is already added to the scene
+        :param q_trajectory: array of configurations of the shape (T, nq)
+        :param fps: framerate of the animation
+        :param times: optional time [s] of each configuration, configurations are 1/fps apart by default
+        :return: the published animation
+        """
+        assert robot.name in self.robots, 'Robot has to be added to the scene before it is animated.'
+        poses = robot.compute_link_poses(q_trajectory)
+        frames = np.arange(poses.shape[0]) if times is None else np.asarray(times, dtype=float) * fps
+        positions = poses[..., :3, 3]
+        quats = quaternions_from_rotations(poses[..., :3, :3])
+        animation = ArrayAnimation(default_framerate=fps)
+        for i, name in enumerate(robot.link_names):
+            clip = ArrayAnimationClip(fps=fps)
+            clip.tracks['position'] = ArrayAnimationTrack('position', 'vector3', frames, positions[:, i])
+            clip.tracks['quaternion'] = ArrayAnimationTrack('quaternion', 'quaternion', frames, quats[:, i])
+            animation.clips[self.vis[name].path] = clip
+        self.vis['animations/animation'].set_animation(animation, play=play, repetitions=repetitions)
+        return animation
+
+    def save_animation(self, animation: Animation, filename: Path | str, objects: bool = True):
+        """Save the animation together with the geometries of all objects in the scene into the compressed numpy file,
+        so that it can be replayed by :func:`load_animation` without recreating the scene. Frames and values of each
+        track are stored as float32 arrays.
+        :param objects: if false, the geometries are not stored, e.g. for the chunks following the first one
+        """
+        tracks, arrays = [], {}
+        for path, clip in animation.clips.items():
+            for track in clip.tracks.values():
+                i = len(tracks)
+                tracks.append(dict(path=path.lower(), name=track.name, jstype=track.jstype, fps=clip.fps))
+                arrays[f'frames_{i}'] = np.asarray(track.frames, dtype=np.float32)
+                arrays[f'values_{i}'] = np.asarray(track.values, dtype=np.float32)
+        if objects:
+            commands = [
+                SetObject(o._geometry, o._material, self.vis[o.name].path).lower() for o in self.objects.values()
+            ]
+            arrays['objects'] = np.frombuffer(umsgpack.packb(commands), dtype=np.uint8)
+        np.savez_compressed(
+            filename,
+            tracks=np.array(json.dumps(dict(tracks=tracks, default_framerate=animation.default_framerate))),
+            **arrays,
+        )
+
+    def load_animation(self, filename: Path | str, play: bool = True, repetitions: int = 1) -> Animation:
+        """Load the animation saved by :func:`save_animation`, create the stored objects in the viewer and publish the
+        animation. The created objects are not added into the scene objects.
+        :param filename: either the saved file or the directory of chunks saved by the :func:`animation` context, the
+            chunks are joined into a single animation in that case
+        """
+        files = sorted(Path(filename).glob('chunk_*.npz')) if Path(filename).is_dir() else [filename]
+        keyframes = {}  # (path, name) -> (fps, jstype, list of frames arrays, list of values arrays)
+        offset, default_framerate = 0, None
+        for file in files:
+            with np.load(file) as data:
+                if 'objects' in data:
+                    for command in umsgpack.unpackb(data['objects'].tobytes()):
+                        self.vis.window.send(_LoweredCommand(command))
+                info = json.loads(str(data['tracks']))
+                default_framerate = info['default_framerate']
+                end = offset
+                for i, t in enumerate(info['tracks']):
+                    frames, values = data[f'frames_{i}'] + np.float32(offset), data[f'values_{i}']
+                    track = keyframes.setdefault((t['path'], t['name']), (t['fps'], t['jstype'], [], []))
+                    if len(frames) > 0:
+                        track[2].append(frames)
+                        track[3].append(values)
+                        end = max(end, int(frames[-1]) + 1)
+                offset = end  # the next chunk starts in the frame following the last frame of this chunk
+        animation = ArrayAnimation(default_framerate=default_framerate)
+        for (path, name), (fps, jstype, frames, values) in keyframes.items():
+            path = MeshcatPath().append(path)
+            if path not in animation.clips:
+                animation.clips[path] = ArrayAnimationClip(fps=fps)
+            track = ArrayAnimationClip.create_track(name, jstype)
+            if len(frames) > 0:
+                _set_track_keyframes(track, np.concatenate(frames), np.concatenate(values))
+            animation.clips[path].tracks[name] = track
+        self.vis['animations/animation'].set_animation(animation, play=play, repetitions=repetitions)
+        return animation
+
+    def render_animation_to_video(
+        self, animation: Animation, filename: Path | str, fps: int | None = None, **kwargs
+    ) -> None:
+        """Render the recorded animation into the video. The tracks are sampled at the framerate of the video, the
+        sampled values are set to the scene objects and the camera (values of paths that do not belong to the scene,
+        e.g. of the loaded animation, are sent to the meshcat directly) and each frame is captured.
+        :param animation: animation recorded by :func:`animation` context, :func:`animate_trajectory` or loaded by
+            :func:`load_animation`
+        :param fps: framerate of the video, the framerate of the animation is used by default; if it differs, the
+            values between keyframes are interpolated (positions linearly, rotations spherically, booleans stepwise)
+        :param kwargs: passed to the :class:`VideoContext`
+        """
+        assert self._animation is None, 'Animation cannot be rendered to video while recording another animation.'
+        fps = animation.default_framerate if fps is None else fps
+        tracks = [(clip, t) for clip in animation.clips.values() for t in clip.tracks.values() if len(t.frames) > 0]
+        duration = max((t.frames[-1] / clip.fps for clip, t in tracks), default=0.0)
+        times = np.arange(int(round(duration * fps)) + 1) / fps
+        samples = {
+            path: {name: sample_track(t, times * clip.fps) for name, t in clip.tracks.items() if len(t.frames) > 0}
+            for path, clip in animation.clips.items()
+        }
+        objects = {self.vis[o.name].path: o for o in self.objects.values()}
+        materials = {self.vis[o.name]['<object>'].path: o for o in self.objects.values()}
+        with VideoContext(scene=self, fps=fps, filename=filename, **kwargs):
+            for i in range(len(times)):
+                for path, values in samples.items():
+                    changed = [k for k, v in values.items() if i == 0 or not np.array_equal(v[i], v[i - 1])]
+                    if changed:
+                        current = {k: v[i] for k, v in values.items()}
+                        self._set_animation_values(path, current, changed, objects, materials)
+                self.render()
+
+    def _set_animation_values(self, path: MeshcatPath, values: dict, changed: list, objects: dict, materials: dict):
+        """Set the changed sampled values of the animation tracks of a single path to the scene. The pose is set if
+        both position and quaternion are animated, otherwise the position is set as a property.
+        :param objects: scene objects indexed by their path
+        :param materials: scene objects indexed by the path of their meshcat object, i.e. path/<object>
         """
-        return AnimationContext(scene=self, fps=fps)
+        camera = self.vis['/Cameras/default']
+        vis = self.vis[path.lower()]
+        if 'position' in values and 'quaternion' in values:
+            if 'position' in changed or 'quaternion' in changed:
+                pose = pose_from_position_quaternion(values['position'], values['quaternion'])
+                if path in objects:
+                    objects[path].pose = pose
+                elif path == camera.path:
+                    self.camera_pose = pose
+                else:
+                    vis.set_transform(pose)
+            changed = [k for k in changed if k not in ('position', 'quaternion')]
+        for key in changed:
+            value = values[key]
+            o = materials.get(path)
+            if o is not None and key == 'material.color':
+                o.color = value
+            elif o is not None and key == 'material.opacity':
+                o.opacity = float(value)
+            elif o is not None and key == 'visible':
+                o.visible = bool(value)
+            elif path == camera['rotated/<object>'].path and key == 'zoom':
+                self.camera_zoom = float(value)
+            else:
+                vis.set_property(key, value.tolist())
 
     def _next_animation_frame(self):
         """Close the current frame (if exists) and create a new one. Applicable only if animation exists. Set objects
@@ -160,24 +421,69 @@ class Scene:
         self._animation_frame = None
         self._animation_frame_counter = None
         self._animation = None
+        self._animation_context = None
         for o in self.objects.values():
             o._set_vis(self.vis)
+            o._sent_pose = None  # the animation could have changed the pose in the browser
         self._camera_vis = self.vis["/Cameras/default"]
 
     def _start_animation(self, fps):
         """Start animation instead of online changes."""
+        self._flush()
         self._animation_frame_counter = itertools.count()
-        self._animation = Animation(default_framerate=fps)
+        self._animation = ArrayAnimation(default_framerate=fps)
+        self._animation_recorded = {}
         self._next_animation_frame()
 
-    def _reset_all_properties(self):
-        """Send all the properties to the browser. It is reset for all animation frames to ensure values do not change
-        due to the interpolation by the properties set in the future."""
+    def _record_animation_frame(self, last: bool = False):
+        """Record properties that changed since their last keyframe into the current frame of the animation. The
+        previous value is recorded also into the previous frame, so that the value is not interpolated over the frames
+        in which it did not change. All properties are recorded in the first frame.
+        :param last: if true, all properties are recorded into the frame, so that all tracks end at the last frame of
+            the animation (or its chunk); otherwise clips of different durations would loop out of sync in the viewer
+        """
+        previous_frame = self._animation.at_frame(self.vis, self._animation_frame.current_frame - 1)
         for o in self.objects.values():
-            o._reset_all_properties()
-        self.camera_zoom = self._camera_zoom  # this will set the starting value of the property
-        if self._camera_pose_modified:
-            self.camera_pose = self._camera_pose
+            properties = o._animation_properties()
+            self._record_properties(o.name, properties, self._animation_frame[o.name], previous_frame[o.name], last)
+        camera = '/Cameras/default'
+        properties = self._camera_animation_properties()
+        self._record_properties(camera, properties, self._animation_frame[camera], previous_frame[camera], last)
+
+    def _record_properties(self, name: str, properties: dict, frame_vis, previous_frame_vis, last: bool = False):
+        """Record properties of a single element into the given animation frame if they changed or if it is the last
+        frame."""
+        recorded = self._animation_recorded.setdefault(name, {})
+        frame = frame_vis.current_frame
+        for key, (value, prop_type, subpath) in properties.items():
+            if key in recorded:
+                last_value, last_frame = recorded[key]
+                if np.array_equal(last_value, value):
+                    if not last or last_frame == frame:
+                        continue
+                elif last_frame < frame - 1:
+                    self._record_property(previous_frame_vis, key, last_value, prop_type, subpath)
+            self._record_property(frame_vis, key, value, prop_type, subpath)
+            recorded[key] = (value, frame)
+
+    @staticmethod
+    def _record_property(frame_vis: AnimationFrameVisualizer, key, value, prop_type, subpath):
+        """Record a single property into the animation frame, type None stands for the pose."""
+        if prop_type is None:
+            frame_vis.set_transform(value)
+        else:
+            element = frame_vis if subpath is None else frame_vis[subpath]
+            element.set_property(key, prop_type, value)
+
+    def _camera_animation_properties(self) -> dict:
+        """Return properties of the camera recorded into the animation, see :func:`Object._animation_properties`. The
+        camera pose is recorded only if it was set, otherwise the user can control the camera during the animation."""
+        properties = {'zoom': (self._camera_zoom, 'number', 'rotated/<object>')}
+        if self._camera_pose_modified or 'pose' in self._animation_recorded.get('/Cameras/default', {}):
+            position = [0, 0, 0] if self._camera_pose_modified else [3, 1, 0]
+            properties['pose'] = (np.array(self._camera_pose), None, None)
+            properties['position'] = (position, 'vector', 'rotated/<object>')
+        return properties
 
     """=== Following functions handle the camera control ==="""
 
@@ -188,7 +494,7 @@ class Scene:
     @camera_zoom.setter
     def camera_zoom(self, v):
         self._camera_zoom = v
-        self._set_property(self._camera_vis['rotated/<object>'], 'zoom', self._camera_zoom, 'number')
+        self._set_property(self._camera_vis['rotated/<object>'], 'zoom', self._camera_zoom)
 
     @property
     def camera_pose(self):
@@ -217,76 +523,443 @@ class Scene:
     def reset_camera(self):
         """Reset camera to default pose and let user interact with it again."""
         self._camera_pose = ArrayWithCallbackOnSetItem(np.eye(4), cb=self._set_camera_transform)
-        self._camera_vis.set_transform(self._camera_pose)
+        if self._animation is None:
+            self._camera_vis.set_transform(self._camera_pose)
         self.camera_zoom = 1.0
         self._camera_enable_user_control()
         self._camera_pose_modified = False
 
     def _set_camera_transform(self):
         # disable human interaction if camera pose is set
-        self._camera_vis.set_transform(self._camera_pose)
+        if self._animation is None:
+            self._camera_vis.set_transform(self._camera_pose)
         self._camera_disable_user_control()
         self._camera_pose_modified = True
 
     def _camera_disable_user_control(self):
-        self._set_property(self._camera_vis['rotated/<object>'], 'position', [0, 0, 0], 'vector')
+        self._set_property(self._camera_vis['rotated/<object>'], 'position', [0, 0, 0])
 
     def _camera_enable_user_control(self):
-        self._set_property(self._camera_vis['rotated/<object>'], 'position', [3, 1, 0], 'vector')
+        self._set_property(self._camera_vis['rotated/<object>'], 'position', [3, 1, 0])
 
     @staticmethod
-    def _set_property(element, key, value, prop_type='number'):
-        """Set property of the object, handle animation frames set_property internally."""
-        if isinstance(element, AnimationFrameVisualizer):
-            element.set_property(key, prop_type, value)
-        else:
+    def _set_property(element, key, value):
+        """Set property of the element online. In the animation, properties are recorded on render."""
+        if not isinstance(element, AnimationFrameVisualizer):
             element.set_property(key, value)
 
 
+def quaternions_from_rotations(rot) -> np.ndarray:
+    """Convert rotation matrices of the shape (..., 3, 3) into quaternions of the shape (..., 4) stored in the
+    [x, y, z, w] order used by meshcat animations."""
+    m = np.asarray(rot, dtype=float)
+    m00, m01, m02 = m[..., 0, 0], m[..., 0, 1], m[..., 0, 2]
+    m10, m11, m12 = m[..., 1, 0], m[..., 1, 1], m[..., 1, 2]
+    m20, m21, m22 = m[..., 2, 0], m[..., 2, 1], m[..., 2, 2]
+    "Compute quaternion from the largest of the diagonal elements to keep the computation numerically stable"
+    with np.errstate(divide='ignore', invalid='ignore'):
+        diagonals = np.stack([m00 + m11 + m22, m00 - m11 - m22, m11 - m00 - m22, m22 - m00 - m11])
+        s = 2 * np.sqrt(np.maximum(1 + diagonals, 0))
+        candidates = np.stack(
+            [
+                np.stack([(m21 - m12) / s[0], (m02 - m20) / s[0], (m10 - m01) / s[0], 0.25 * s[0]], axis=-1),
+                np.stack([0.25 * s[1], (m01 + m10) / s[1], (m02 + m20) / s[1], (m21 - m12) / s[1]], axis=-1),
+                np.stack([(m01 + m10) / s[2], 0.25 * s[2], (m12 + m21) / s[2], (m02 - m20) / s[2]], axis=-1),
+                np.stack([(m02 + m20) / s[3], (m12 + m21) / s[3], 0.25 * s[3], (m10 - m01) / s[3]], axis=-1),
+            ]
+        )
+    best = np.argmax(s, axis=0)
+    q = np.take_along_axis(candidates, best[np.newaxis, ..., np.newaxis], axis=0)[0]
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+def slerp(start, end, t) -> np.ndarray:
+    """Spherical linear interpolation between quaternions start and end of the shape (..., 4) at times t from [0, 1]
+    of the shape (...). The shortest path is used, i.e. the sign of end quaternion is flipped if needed."""
+    start, end = np.asarray(start, dtype=float), np.asarray(end, dtype=float)
+    t = np.asarray(t, dtype=float)[..., np.newaxis]
+    d = np.sum(start * end, axis=-1, keepdims=True)
+    end, d = np.where(d < 0, -end, end), np.abs(d)
+    theta = np.arccos(np.clip(d, 0.0, 1.0))
+    linear = d > 1 - 1e-9  # use linear interpolation for (almost) identical quaternions
+    sin = np.where(linear, 1.0, np.sin(theta))
+    a = np.where(linear, 1 - t, np.sin((1 - t) * theta) / sin)
+    b = np.where(linear, t, np.sin(t * theta) / sin)
+    q = a * start + b * end
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+def sample_track(track: AnimationTrack, frames) -> np.ndarray:
+    """Sample values of the animation track at the given (possibly fractional) frames. Values are interpolated
+    linearly, quaternions spherically and booleans are held from the last keyframe. Values before the first or after
+    the last keyframe are equal to the first or the last keyframe value, respectively."""
+    keys = np.asarray(track.frames, dtype=float)
+    values = np.asarray(track.values, dtype=bool if track.jstype == 'boolean' else float)
+    frames = np.asarray(frames, dtype=float)
+    i = np.clip(np.searchsorted(keys, frames, side='right') - 1, 0, len(keys) - 1)
+    if track.jstype == 'boolean' or len(keys) == 1:
+        return values[i]
+    i = np.minimum(i, len(keys) - 2)
+    t = np.clip((frames - keys[i]) / np.maximum(keys[i + 1] - keys[i], 1e-9), 0.0, 1.0)
+    start, end = values[i], values[i + 1]
+    if track.jstype == 'quaternion':
+        return slerp(start, end, t)
+    return start + (t if values.ndim == 1 else t[:, np.newaxis]) * (end - start)
+
+
+def pose_from_position_quaternion(position, quaternion) -> np.ndarray:
+    """Create 4x4 pose from the position and the quaternion stored in the [x, y, z, w] order."""
+    x, y, z, w = np.asarray(quaternion, dtype=float) / np.linalg.norm(quaternion)
+    pose = np.eye(4)
+    pose[:3, :3] = [
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ]
+    pose[:3, 3] = position
+    return pose
+
+
+class ArrayAnimationTrack(AnimationTrack):
+    """Animation track that stores frames and values in growable float32 numpy buffers instead of lists of floats.
+    Frames and values are sent as packed float32 arrays (times/values representation of three.js tracks)."""
+
+    __slots__ = ['_frames', '_values', '_size', '_scalar']
+
+    def __init__(self, name, jstype, frames=None, values=None):
+        self.name = name
+        self.jstype = jstype
+        self._frames = np.empty(16, dtype=np.float32)
+        self._values = None  # allocated by the first value as its dimension is not known in advance
+        self._size = 0
+        self._scalar = False
+        if frames is not None:
+            self.set_keyframes(frames, values)
+
+    @property
+    def frames(self):
+        return self._frames[: self._size]
+
+    @property
+    def values(self):
+        values = self._values[: self._size] if self._values is not None else np.empty((0, 1), dtype=np.float32)
+        return values[:, 0] if self._scalar else values
+
+    def set_keyframes(self, frames, values):
+        """Replace all keyframes of the track."""
+        values = np.asarray(values, dtype=np.float32)
+        self._frames = np.array(frames, dtype=np.float32).reshape(-1)
+        self._size = self._frames.shape[0]
+        if self._size == 0:  # buffers are allocated as in the constructor, i.e. by the first value
+            self._frames, self._values, self._scalar = np.empty(16, dtype=np.float32), None, False
+            return
+        self._scalar = values.ndim == 1
+        self._values = np.array(values.reshape(self._size, -1))
+
+    def set_property(self, frame, value):
+        value = np.asarray(value, dtype=np.float32)
+        if self._values is None:
+            self._scalar = value.ndim == 0
+            self._values = np.empty((self._frames.shape[0], value.size), dtype=np.float32)
+        if self._size == self._frames.shape[0]:
+            self._frames = np.concatenate([self._frames, np.empty_like(self._frames)])
+            self._values = np.concatenate([self._values, np.empty_like(self._values)])
+        i = self._size
+        if i > 0 and frame < self._frames[i - 1]:  # keep frames sorted, new frames are usually appended
+            i = int(np.searchsorted(self._frames[: self._size], frame, side='right'))
+            dst, src = slice(i + 1, self._size + 1), slice(i, self._size)
+            self._frames[dst] = self._frames[src]
+            self._values[dst] = self._values[src]
+        self._frames[i] = frame
+        self._values[i] = value.reshape(-1)
+        self._size += 1
+
+    def lower(self):
+        return {
+            u"name": str("." + self.name),
+            u"type": str(self.jstype),
+            u"times": g.pack_numpy_array(self.frames)[u"array"],
+            u"values": g.pack_numpy_array(self.values.reshape(-1))[u"array"],
+        }
+
+
+class ArrayAnimationClip(AnimationClip):
+    """Animation clip that creates :class:`ArrayAnimationTrack` for numeric properties."""
+
+    __slots__ = []
+
+    @staticmethod
+    def create_track(name, jstype):
+        return AnimationTrack(name, jstype) if jstype == 'boolean' else ArrayAnimationTrack(name, jstype)
+
+    def set_property(self, frame, property, jstype, value):
+        if property not in self.tracks:
+            self.tracks[property] = self.create_track(property, jstype)
+        self.tracks[property].set_property(frame, value)
+
+
+class ArrayAnimationFrameVisualizer(AnimationFrameVisualizer):
+    """Frame of the :class:`ArrayAnimation`."""
+
+    __slots__ = []
+
+    def get_clip(self):
+        if self.path not in self.animation.clips:
+            self.animation.clips[self.path] = ArrayAnimationClip(fps=self.animation.default_framerate)
+        return self.animation.clips[self.path]
+
+    def __getitem__(self, path):
+        return ArrayAnimationFrameVisualizer(self.animation, self.path.append(path), self.current_frame)
+
+
+class ArrayAnimation(Animation):
+    """Meshcat animation that stores numeric tracks in float32 numpy buffers, see :class:`ArrayAnimationTrack`."""
+
+    __slots__ = []
+
+    def at_frame(self, visualizer, frame):
+        return ArrayAnimationFrameVisualizer(self, visualizer.path, frame)
+
+
+def _set_track_keyframes(track: AnimationTrack, frames: np.ndarray, values: np.ndarray):
+    """Replace keyframes of either array based or list based animation track."""
+    if isinstance(track, ArrayAnimationTrack):
+        track.set_keyframes(frames, values)
+    else:
+        track.frames, track.values = (
+            frames.tolist(),
+            values.astype(bool if track.jstype == 'boolean' else float).tolist(),
+        )
+
+
+class _LoweredCommand:
+    """Meshcat command that was already lowered, e.g. loaded from the file."""
+
+    def __init__(self, data: dict) -> None:
+        super().__init__()
+        self.data = data
+
+    def lower(self):
+        return self.data
+
+
+class BatchContext:
+    """Used to provide 'with batch' capability for the scene."""
+
+    def __init__(self, scene: Scene) -> None:
+        super().__init__()
+        self.scene: Scene = scene
+
+    def __enter__(self):
+        self.scene._batch_depth += 1
+        self.scene._update_objects_deferred()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Send all postponed changes at once, unless the batch is nested in another batch."""
+        self.scene._batch_depth -= 1
+        self.scene._update_objects_deferred()
+        if self.scene._batch_depth == 0:
+            self.scene._flush()
+
+
 class AnimationContext:
     """Used to provide 'with animation' capability for the viewer."""
 
-    def __init__(self, scene: Scene, fps: int) -> None:
+    def __init__(
+        self,
+        scene: Scene,
+        fps: int,
+        tolerance: float | tuple[float, float] | None = None,
+        chunk_duration: float | None = None,
+        chunk_directory: Path | str | None = None,
+    ) -> None:
         super().__init__()
         self.scene: Scene = scene
         self.fps: int = fps
+        self.tolerance = tolerance
+        self.chunk_frames = None if chunk_duration is None else max(1, int(round(chunk_duration * fps)))
+        self.animation: Animation | None = None  # the last published animation (or its chunk)
+        self.chunk_directory = None if chunk_directory is None else Path(chunk_directory)
+        self.chunk_files: list[Path] = []  # files of the chunks saved into the chunk directory
 
     def __enter__(self):
+        if self.chunk_directory is not None:
+            assert not any(self.chunk_directory.glob('chunk_*.npz')), 'Chunk directory contains other recording.'
+            self.chunk_directory.mkdir(parents=True, exist_ok=True)
         self.scene._start_animation(self.fps)
+        self.scene._animation_context = self
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Publish animation and clear all internal changes that were required to render to frame instead of online"""
-        self.remove_clips_duplicates()
-        self.scene.vis['animations/animation'].set_animation(self.scene._animation)
+        self.scene._flush()
+        self.scene._record_animation_frame(last=True)
+        self.publish()
         self.scene._close_animation()
 
+    def _is_chunk_complete(self) -> bool:
+        """Return true if the current frame is the last frame of the chunk."""
+        return self.chunk_frames is not None and self.scene._animation_frame.current_frame + 1 >= self.chunk_frames
+
+    def _next_frame(self):
+        """Start the next frame of the animation, called by the scene on render. If the chunk is complete, it is
+        published and the new animation is started."""
+        if self._is_chunk_complete():
+            self.publish()
+            self.scene._start_animation(self.fps)
+        else:
+            self.scene._next_animation_frame()
+
+    def publish(self):
+        """Remove redundant keyframes and send the recorded animation to the viewer. The animation is saved into the
+        chunk directory if it is set; the geometries of the objects are saved only with the first chunk."""
+        self.remove_clips_duplicates()
+        if self.tolerance is not None:
+            self.decimate_pose_tracks(*np.broadcast_to(self.tolerance, 2))
+        self.animation = self.scene._animation
+        self.scene.vis['animations/animation'].set_animation(self.animation)
+        if self.chunk_directory is not None:
+            filename = self.chunk_directory / f'chunk_{len(self.chunk_files):06d}.npz'
+            self.scene.save_animation(self.animation, filename, objects=len(self.chunk_files) == 0)
+            self.chunk_files.append(filename)
+
     def remove_clips_duplicates(self):
         """Meshcat doesn't like if same property as modified twice in the same frame - it does weird jumping in
-        animation. In this function we find such a duplicates and keep only the last change of the property."""
+        animation. In this function we find such a duplicates and keep only the last change of the property. Keyframes
+        inside runs of identical consecutive values are removed too as they do not change the animation."""
         for clip in self.scene._animation.clips.values():
             for track in clip.tracks.values():
-                indices_to_remove = set()
-                last_f = None
-                for i, f in enumerate(track.frames):
-                    if f == last_f:
-                        indices_to_remove.add(i - 1)
-                    last_f = f
-                if len(indices_to_remove) > 0:
-                    track.frames = [f for i, f in enumerate(track.frames) if i not in indices_to_remove]
-                    track.values = [v for i, v in enumerate(track.values) if i not in indices_to_remove]
+                if len(track.frames) < 2:
+                    continue
+                frames, values = np.asarray(track.frames), np.asarray(track.values)
+                keep = np.append(frames[1:] != frames[:-1], True)  # the last keyframe of the frame is kept
+                frames, values = frames[keep], values[keep]
+                same = np.all(values[1:].reshape(len(frames) - 1, -1) == values[:-1].reshape(len(frames) - 1, -1), 1)
+                keep = np.ones(len(frames), dtype=bool)
+                keep[1:-1] = ~(same[:-1] & same[1:])  # keep only the first and the last keyframe of each run
+                _set_track_keyframes(track, frames[keep], values[keep])
+
+    def decimate_pose_tracks(self, position_tolerance: float, rotation_tolerance: float):
+        """Remove keyframes of position and quaternion tracks that can be reconstructed by the interpolation of the
+        remaining keyframes within the given tolerances [m] and [rad] (Douglas-Peucker algorithm)."""
+        for clip in self.scene._animation.clips.values():
+            for name, track in clip.tracks.items():
+                if name not in ('position', 'quaternion') or len(track.frames) < 3:
+                    continue
+                frames, values = np.asarray(track.frames, dtype=float), np.asarray(track.values, dtype=float)
+                if name == 'position':
+                    keep = self._douglas_peucker(frames, values, self._lerp_error, position_tolerance)
+                else:
+                    keep = self._douglas_peucker(frames, values, self._slerp_error, rotation_tolerance)
+                _set_track_keyframes(track, frames[keep], values[keep])
+
+    @staticmethod
+    def _douglas_peucker(frames, values, error_fn, tolerance) -> np.ndarray:
+        """Return mask of keyframes that need to be kept, so that the error of the interpolation of the removed
+        keyframes is below the tolerance."""
+        keep = np.zeros(len(frames), dtype=bool)
+        keep[[0, -1]] = True
+        segments = [(0, len(frames) - 1)]
+        while segments:
+            a, b = segments.pop()
+            if b - a < 2:
+                continue
+            inner = slice(a + 1, b)
+            t = (frames[inner] - frames[a]) / (frames[b] - frames[a])
+            errors = error_fn(values[a], values[b], t, values[inner])
+            i = int(np.argmax(errors))
+            if errors[i] > tolerance:
+                keep[a + 1 + i] = True
+                segments += [(a, a + 1 + i), (a + 1 + i, b)]
+        return keep
+
+    @staticmethod
+    def _lerp_error(start, end, t, values):
+        """Distance of values from the linear interpolation between start and end at times t from [0, 1]."""
+        return np.linalg.norm(start + t[:, np.newaxis] * (end - start) - values, axis=-1)
+
+    @staticmethod
+    def _slerp_error(start, end, t, values):
+        """Angle between quaternions values and the spherical interpolation between start and end quaternions."""
+        q = slerp(start, end, t)
+        values = values / np.linalg.norm(values, axis=-1, keepdims=True)
+        return 2 * np.arccos(np.clip(np.abs(np.sum(q * values, axis=-1)), 0.0, 1.0))
 
 
 class VideoContext:
-    def __init__(self, scene: Scene, fps: int, filename: str | Path, **kwargs) -> None:
+    def __init__(
+        self,
+        scene: Scene,
+        fps: int,
+        filename: str | Path,
+        queue_size: int = 32,
+        workers: int = 2,
+        reuse_unchanged: bool = True,
+        **kwargs,
+    ) -> None:
+        """Video recording pipeline. Images are captured in the main thread by the :func:`Scene.render`, converted to
+        numpy arrays by the pool of workers and encoded in the order of capturing by the encoding thread.
+        :param queue_size: maximum number of captured frames waiting for encoding, capturing blocks if it is full
+        :param workers: number of threads converting the captured images
+        :param reuse_unchanged: if true, the last frame is repeated instead of capturing a new image if nothing was
+            sent to the meshcat since the last capture; disable it if the view is changed in the browser while recording
+        """
         super().__init__()
         self.scene = scene
         self.video_writer = imageio.get_writer(uri=filename, fps=fps, **kwargs)
+        self._queue_size = queue_size
+        self._workers = workers
+        self._reuse_unchanged = reuse_unchanged
+        self._last_frame = None  # future of the last captured frame
+        self._pool: ThreadPoolExecutor | None = None
+        self._frames: queue.Queue | None = None  # futures of converted frames in the order of capturing
+        self._encoder: threading.Thread | None = None
+        self._error: Exception | None = None
 
     def __enter__(self):
-        self.scene._video_writer = self.video_writer
+        self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='robomeshcat-video')
+        self._frames = queue.Queue(maxsize=self._queue_size)
+        self._encoder = threading.Thread(target=self._encode, name='robomeshcat-encoder', daemon=True)
+        self._encoder.start()
+        self.scene._video_context = self
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self.scene._video_context = None
+        self._frames.put(None)
+        self._encoder.join()
+        self._pool.shutdown()
         self.video_writer.close()
-        self.scene._video_writer = None
+        if exc_type is None:
+            self._raise_error()
+
+    def append_image(self, image):
+        """Queue captured image for the conversion and encoding."""
+        self._raise_error()
+        self._last_frame = self._pool.submit(np.array, image)
+        self._frames.put(self._last_frame)
+
+    def repeat_last_image(self) -> bool:
+        """Queue the last captured frame again. Return false if there is no frame to repeat or reusing is disabled."""
+        if not self._reuse_unchanged or self._last_frame is None:
+            return False
+        self._raise_error()
+        self._frames.put(self._last_frame)
+        return True
+
+    def _encode(self):
+        """Write converted frames to the video, executed in the background thread."""
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                return
+            try:
+                if self._error is None:
+                    self.video_writer.append_data(frame.result())
+            except Exception as e:
+                self._error = e
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-16
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+from __future__ import annotations
+
+import atexit
+import itertools
+import threading
+from collections import deque, OrderedDict
+
+import numpy as np
+from meshcat.commands import SetProperty, SetTransform
+
+
+def command_key(command):
+    """Return the key identifying the value updated by the command, i.e. the path and the property name, or None if
+    the command cannot be replaced by a newer one (e.g. creation or deletion of the object)."""
+    if isinstance(command, SetTransform):
+        return 'set_transform', command.path
+    if isinstance(command, SetProperty):
+        return 'set_property', command.path, command.key
+    return None
+
+
+class CoalescingOutbox:
+    """Queue of commands that keeps only the newest command for each path and property. The newer command replaces
+    the queued one at its position, so stale updates are never transmitted. Commands without key (e.g. creation or
+    deletion of the object) are kept in the order and updates are never coalesced over them."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._commands: OrderedDict = OrderedDict()
+        self._generation = 0  # increased by each command without key to prevent reordering over it
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._commands)
+
+    def append(self, command):
+        key = command_key(command)
+        if key is None:
+            self._generation += 1
+            self._commands[(self._generation, next(self._counter))] = command
+            self._generation += 1
+        else:
+            self._commands[(self._generation, key)] = command
+
+    def replace(self, command) -> bool:
+        """Replace the queued command with the same key, return false if there is no such command."""
+        key = command_key(command)
+        if key is None or (self._generation, key) not in self._commands:
+            return False
+        self._commands[(self._generation, key)] = command
+        return True
+
+    def popleft(self):
+        return self._commands.popitem(last=False)[1]
+
+
+class CommandSender:
+    """Wrapper of the meshcat viewer window that sends the commands either synchronously (default) or from a background
+    thread. It is installed as a window of the visualizer by the scene, so all commands created by objects, robots and
+    the scene pass through it."""
+
+    policies = ('block', 'drop_oldest', 'coalesce')
+
+    def __init__(self, window, async_send: bool = False, queue_size: int = 1000, policy: str = 'block') -> None:
+        """
+        :param window: meshcat viewer window used to send the commands
+        :param async_send: if true, commands are put into the queue and sent from the background thread
+        :param queue_size: maximum number of commands waiting in the queue
+        :param policy: what to do if the queue is full, one of:
+            'block' - wait until there is a space in the queue,
+            'drop_oldest' - remove the oldest transformation/property update from the queue,
+            'coalesce' - keep only the newest update of each path and property in the queue (see
+            :class:`CoalescingOutbox`), block if the queue is full of distinct updates
+        """
+        super().__init__()
+        assert policy in self.policies, f'Unknown policy {policy}, use one of {self.policies}.'
+        self._window = window
+        self._async = async_send
+        self._queue_size = queue_size
+        self._policy = policy
+
+        self._queue: deque | CoalescingOutbox = CoalescingOutbox() if policy == 'coalesce' else deque()
+        self._in_flight = 0
+        self._error: Exception | None = None
+        self._condition = threading.Condition()
+        self._socket_lock = threading.Lock()  # zmq socket cannot be used from multiple threads at once
+        self._thread = None
+        self._closing = False  # if true, the background thread stops once the queue is empty
+        self.modified = True  # set by every sent command, cleared by the user, e.g. when the image is captured
+        if self._async:
+            self._thread = threading.Thread(target=self._run, name='robomeshcat-sender', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)  # queued commands are not lost at the interpreter exit
+
+    def __getattr__(self, item):
+        """Delegate everything else (e.g. open, wait, web_url) to the wrapped window."""
+        if item.startswith('_'):
+            raise AttributeError(item)
+        return getattr(self._window, item)
+
+    def send(self, command):
+        """Send the command or put it into the queue if sending asynchronously."""
+        self.modified = True
+        if not self._async:
+            with self._socket_lock:
+                self._window.send(command)
+            return
+        if isinstance(command, SetTransform):  # matrix is usually a live pose array of the object, queue its value
+            command = SetTransform(np.array(command.matrix), command.path)
+        with self._condition:
+            self._raise_error()
+            while len(self._queue) >= self._queue_size:
+                if self._policy == 'drop_oldest' and self._drop_oldest():
+                    break
+                if self._policy == 'coalesce' and self._queue.replace(command):
+                    return
+                self._condition.wait()
+            self._queue.append(command)
+            self._condition.notify_all()
+
+    def _drop_oldest(self) -> bool:
+        """Remove the oldest replaceable command from the queue. Return false if there is no such command."""
+        for i, c in enumerate(self._queue):
+            if command_key(c) is not None:
+                del self._queue[i]
+                return True
+        return False
+
+    def _run(self):
+        """Send the queued commands, executed in the background thread."""
+        while True:
+            with self._condition:
+                while len(self._queue) == 0:
+                    if self._closing:
+                        return
+                    self._condition.wait()
+                command = self._queue.popleft()
+                self._in_flight += 1
+                self._condition.notify_all()
+            try:
+                with self._socket_lock:
+                    self._window.send(command)
+            except Exception as e:
+                self._error = e
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _raise_error(self):
+        if self._error is not None:
+            e, self._error = self._error, None
+            raise e
+
+    def flush(self):
+        """Block until all queued commands are sent."""
+        with self._condition:
+            while len(self._queue) > 0 or self._in_flight > 0:
+                self._condition.wait()
+            self._raise_error()
+
+    def close(self):
+        """Send all queued commands and stop the background thread. Commands sent after closing are sent
+        synchronously."""
+        if self._thread is None:
+            return
+        atexit.unregister(self.close)
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._thread = None
+        self._async = False
+        self._raise_error()
+
+    def get_image(self):
+        """Capture the image after all queued commands are sent."""
+        self.flush()
+        with self._socket_lock:
+            return self._window.get_image()
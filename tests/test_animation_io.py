@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-16
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from meshcat.animation import AnimationTrack
+from meshcat.path import Path as MeshcatPath
+
+from robomeshcat import Scene
+from robomeshcat.scene import ArrayAnimation, ArrayAnimationClip, ArrayAnimationTrack
+
+
+class TestAnimationSaveLoad(unittest.TestCase):
+    def test_round_trip_of_tracks(self):
+        with mock.patch('robomeshcat.scene.meshcat.Visualizer'):
+            scene = Scene(open=False, wait_for_open=False)
+        animation = ArrayAnimation(default_framerate=25)
+        clip = ArrayAnimationClip(fps=25)
+        clip.tracks['position'] = ArrayAnimationTrack('position', 'vector3', [0, 5, 7], np.arange(9).reshape(3, 3))
+        clip.tracks['material.opacity'] = ArrayAnimationTrack('material.opacity', 'number', [0, 3], [1.0, 0.25])
+        clip.tracks['visible'] = AnimationTrack('visible', 'boolean', [0, 4, 9], [True, False, True])
+        animation.clips[MeshcatPath(('meshcat', 'obj'))] = clip
+
+        with tempfile.TemporaryDirectory() as d:
+            filename = Path(d) / 'animation.npz'
+            scene.save_animation(animation, filename)
+            loaded = scene.load_animation(filename, play=False)
+
+        self.assertEqual(loaded.default_framerate, 25)
+        loaded_clip = loaded.clips[MeshcatPath(('meshcat', 'obj'))]
+        self.assertEqual(loaded_clip.fps, 25)
+        self.assertEqual(set(loaded_clip.tracks), set(clip.tracks))
+        for name, track in clip.tracks.items():
+            loaded_track = loaded_clip.tracks[name]
+            self.assertEqual(loaded_track.jstype, track.jstype)
+            np.testing.assert_array_equal(loaded_track.frames, track.frames)
+            np.testing.assert_array_equal(loaded_track.values, track.values)
+        self.assertEqual(loaded_clip.tracks['visible'].values, [True, False, True])
+        self.assertIsInstance(loaded_clip.tracks['visible'].values[0], bool)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-16
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+
+import unittest
+
+import numpy as np
+from meshcat.animation import AnimationTrack
+
+from robomeshcat.scene import (
+    AnimationContext,
+    ArrayAnimationTrack,
+    pose_from_position_quaternion,
+    quaternions_from_rotations,
+    sample_track,
+    slerp,
+)
+
+
+class TestAnimationSampling(unittest.TestCase):
+    def test_sample_position_track(self):
+        track = ArrayAnimationTrack('position', 'vector3', [0, 10], [[0, 0, 0], [1, 2, 3]])
+        samples = sample_track(track, [-1, 5, 10, 20])
+        self.assertTrue(np.allclose(samples, [[0, 0, 0], [0.5, 1, 1.5], [1, 2, 3], [1, 2, 3]]))
+
+    def test_sample_boolean_track_is_stepwise(self):
+        track = AnimationTrack('visible', 'boolean', [0, 10], [True, False])
+        self.assertEqual(sample_track(track, [0, 9.9, 10]).tolist(), [True, True, False])
+
+    def test_slerp_shortest_path(self):
+        q0 = np.array([0, 0, 0, 1])
+        q1 = np.array([0, 0, -np.sin(np.pi / 4), -np.cos(np.pi / 4)])  # 90 deg around z with the negative sign
+        q = slerp(q0, q1, 0.5)
+        self.assertTrue(np.allclose(np.abs(q), [0, 0, np.sin(np.pi / 8), np.cos(np.pi / 8)]))
+
+    def test_quaternions_from_rotations_round_trip(self):
+        rng = np.random.default_rng(0)
+        quats = rng.normal(size=(100, 4))
+        axes = [[1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 0], [1, 0, -1], [1, 1, 1]]
+        quats = np.concatenate([quats, np.pad(axes, ((0, 0), (0, 1)))])  # rotations by 180 deg around the axes
+        rotations = np.array([pose_from_position_quaternion(np.zeros(3), q)[:3, :3] for q in quats])
+        rotations = np.concatenate(
+            [rotations, [np.eye(3), np.diag([1, -1, -1]), np.diag([-1, 1, -1]), np.diag([-1, -1, 1])]]
+        )
+        q = quaternions_from_rotations(rotations.reshape(-1, 2, 3, 3)).reshape(-1, 4)
+        np.testing.assert_allclose(np.linalg.norm(q, axis=-1), 1, atol=1e-12)
+        np.testing.assert_allclose(np.abs(q[-3:]), np.eye(4)[:3], atol=1e-12)  # [x, y, z, w] order
+        restored = np.array([pose_from_position_quaternion(np.zeros(3), qi)[:3, :3] for qi in q])
+        np.testing.assert_allclose(restored, rotations, atol=1e-12)
+
+    def test_decimation_error_is_within_tolerance(self):
+        rng = np.random.default_rng(0)
+        frames = np.arange(300, dtype=float)
+        t = frames / 300
+        positions = np.stack([np.sin(t), np.cos(2 * t), 0.1 * t], axis=-1) + rng.normal(scale=1e-5, size=(300, 3))
+        angle = 3 * t**2  # rotation around the diagonal axis with increasing speed
+        quats = np.stack(
+            [np.sin(angle / 2) * np.sqrt(0.5), np.sin(angle / 2) * np.sqrt(0.5), 0 * t, np.cos(angle / 2)], -1
+        )
+        for jstype, values, error_fn in [
+            ('vector3', positions, AnimationContext._lerp_error),
+            ('quaternion', quats, AnimationContext._slerp_error),
+        ]:
+            for tolerance in [1e-3, 1e-2]:
+                keep = AnimationContext._douglas_peucker(frames, values, error_fn, tolerance)
+                self.assertTrue(keep[0] and keep[-1])
+                self.assertLess(keep.sum(), len(frames) / 2)
+                track = AnimationTrack(jstype, jstype, frames[keep].tolist(), values[keep].tolist())
+                restored = sample_track(track, frames)
+                if jstype == 'quaternion':
+                    errors = 2 * np.arccos(np.clip(np.abs(np.sum(restored * values, axis=-1)), 0, 1))
+                else:
+                    errors = np.linalg.norm(restored - values, axis=-1)
+                self.assertLessEqual(errors.max(), tolerance + 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-16
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+
+import unittest
+
+import numpy as np
+
+from robomeshcat.scene import ArrayAnimationTrack
+
+
+class TestArrayAnimationTrack(unittest.TestCase):
+    def test_buffers_grow(self):
+        track = ArrayAnimationTrack('position', 'vector3')
+        values = np.arange(300).reshape(100, 3)
+        for frame, value in enumerate(values):
+            track.set_property(frame, value)
+        np.testing.assert_array_equal(track.frames, np.arange(100))
+        np.testing.assert_array_equal(track.values, values)
+        self.assertEqual(track.values.dtype, np.float32)
+
+    def test_frames_inserted_out_of_order_are_sorted(self):
+        track = ArrayAnimationTrack('material.opacity', 'number')
+        for frame in [5, 1, 9, 3, 1, 0, 7]:
+            track.set_property(frame, frame / 10)
+        np.testing.assert_array_equal(track.frames, [0, 1, 1, 3, 5, 7, 9])
+        np.testing.assert_allclose(track.values, np.array([0, 1, 1, 3, 5, 7, 9]) / 10)
+        self.assertEqual(track.values.ndim, 1)
+
+    def test_empty_keyframes(self):
+        for values in [[], np.empty((0, 3))]:
+            track = ArrayAnimationTrack('position', 'vector3', [], values)
+            self.assertEqual(len(track.frames), 0)
+            self.assertEqual(len(track.values), 0)
+            track.lower()  # empty track can be sent
+            track.set_property(2, [1, 2, 3])
+            track.set_property(1, [4, 5, 6])
+            np.testing.assert_array_equal(track.frames, [1, 2])
+            np.testing.assert_array_equal(track.values, [[4, 5, 6], [1, 2, 3]])
+
+
+if __name__ == '__main__':
+    unittest.main()
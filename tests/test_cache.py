@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-16
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import meshcat.geometry as g
+
+from robomeshcat.cache import DiskCache, LRUCache, estimate_nbytes
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_least_recently_used_is_evicted(self):
+        cache = LRUCache(max_bytes=20)
+        cache.put('a', b'a' * 10)
+        cache.put('b', b'b' * 10)
+        cache.get('a')
+        cache.put('c', b'c' * 10)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.nbytes, 20)
+
+    def test_value_is_created_once(self):
+        cache = LRUCache(max_bytes=100)
+        calls = []
+        for _ in range(3):
+            self.assertEqual(cache.get_or_create('key', lambda: calls.append(1) or 'value'), 'value')
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_creation_is_not_cached(self):
+        cache = LRUCache(max_bytes=100)
+
+        def fail():
+            raise FileNotFoundError('mesh.stl')
+
+        self.assertRaises(FileNotFoundError, cache.get_or_create, 'key', fail)
+        self.assertNotIn('key', cache)
+        self.assertEqual(cache._key_locks, {})
+        self.assertEqual(cache.get_or_create('key', lambda: 'value'), 'value')
+
+    def test_estimate_counts_arrays_in_slots(self):
+        vertices, faces = np.zeros((100, 3), dtype=np.float32), np.zeros((50, 3), dtype=np.uint32)
+        geometry = g.TriangularMeshGeometry(vertices, faces)  # vertices and faces are stored in __slots__
+        self.assertGreaterEqual(estimate_nbytes(geometry), vertices.nbytes + faces.nbytes)
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = DiskCache(Path(self.directory.name) / 'cache')
+
+    def files(self, pattern='*'):
+        return sorted(f.name for f in Path(self.cache.directory).glob(pattern))
+
+    def test_round_trip(self):
+        arrays = dict(vertices=np.random.rand(10, 3).astype(np.float32), faces=np.arange(30, dtype=np.uint32))
+        self.assertIsNone(self.cache.get(('mesh', 1.0)))
+        self.cache.put(('mesh', 1.0), arrays)
+        loaded = self.cache.get(('mesh', 1.0))
+        self.assertEqual(set(loaded), set(arrays))
+        for k, v in arrays.items():
+            np.testing.assert_array_equal(loaded[k], v)
+            self.assertEqual(loaded[k].dtype, v.dtype)
+        self.assertIsNone(self.cache.get(('mesh', 2.0)))
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(('mesh', 1.0)))
+
+    def test_failed_write_keeps_previous_file(self):
+        self.cache.put('key', dict(a=np.zeros(3)))
+        with mock.patch('robomeshcat.cache.np.savez', side_effect=OSError('disk full')):
+            self.cache.put('key', dict(a=np.ones(3)))
+        np.testing.assert_array_equal(self.cache.get('key')['a'], np.zeros(3))
+        self.assertEqual(self.files('*.tmp'), [])
+        with mock.patch('robomeshcat.cache.os.replace', wraps=os.replace) as replace:
+            self.cache.put('key', dict(a=np.ones(3)))
+        self.assertEqual(replace.call_count, 1)  # file is written to the temporary file and moved to its place
+        np.testing.assert_array_equal(self.cache.get('key')['a'], np.ones(3))
+        self.assertEqual(len(self.files()), 1)
+
+    def test_unwritable_directory_disables_cache(self):
+        file = Path(self.directory.name) / 'file'
+        file.write_text('')
+        cache = DiskCache(file / 'cache')  # directory cannot be created inside the file
+        cache.put('key', dict(a=np.zeros(3)))
+        self.assertIsNone(cache.get('key'))
+        cache = DiskCache(None)
+        cache.put('key', dict(a=np.zeros(3)))
+        self.assertIsNone(cache.get('key'))
+
+    def test_least_recently_used_files_are_removed(self):
+        for i, key in enumerate(['a', 'b', 'c']):
+            self.cache.put(key, dict(a=np.zeros(100)))
+            os.utime(self.cache._file(key), ns=(i * 10**9, i * 10**9))
+        self.cache.max_bytes = 3 * self.cache._file('a').stat().st_size
+        self.assertIsNotNone(self.cache.get('a'))  # 'b' becomes the least recently used
+        self.cache.put('d', dict(a=np.zeros(100)))
+        self.assertEqual(len(self.files('*.npz')), 3)
+        self.assertIsNone(self.cache.get('b'))
+        for key in ['a', 'c', 'd']:
+            self.assertIsNotNone(self.cache.get(key))
+
+
+if __name__ == '__main__':
+    unittest.main()
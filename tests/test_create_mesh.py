@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-16
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from robomeshcat import Object
+from robomeshcat.cache import disk_cache
+
+OBJ_WITH_UVS = '''mtllib material.mtl
+usemtl material
+v 0 0 0
+v 1 0 0
+v 0 1 0
+vt 0 0
+vt 1 0
+vt 0 1
+f 1/1 2/2 3/3
+'''
+
+
+class TestCreateMesh(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        Image.fromarray(np.full((4, 4, 3), 200, dtype=np.uint8)).save(self.path / 'texture.png')
+        patcher = mock.patch.object(disk_cache, 'directory', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
+    def write_obj(self, material: str, obj: str = OBJ_WITH_UVS) -> Path:
+        (self.path / 'material.mtl').write_text(material)
+        (self.path / 'mesh.obj').write_text(obj)
+        return self.path / 'mesh.obj'
+
+    def test_uvs_are_kept_for_user_texture(self):
+        mesh = self.write_obj('newmtl material\nKd 1.0 0.0 0.0\n')
+        o = Object.create_mesh(mesh, texture=self.path / 'texture.png')
+        self.assertIsNotNone(o._texture)
+        self.assertIsNotNone(o._geometry.uvs)
+
+    def test_uvs_are_kept_for_material_texture(self):
+        mesh = self.write_obj('newmtl material\nmap_Kd texture.png\n')
+        o = Object.create_mesh(mesh)
+        self.assertIsNotNone(o._texture)
+        self.assertIsNotNone(o._geometry.uvs)
+
+    def test_uniform_color_of_simple_material(self):
+        mesh = self.write_obj('newmtl material\nKd 1.0 0.0 0.0\n', obj=OBJ_WITH_UVS.replace('vt', '# vt'))
+        o = Object.create_mesh(mesh)
+        self.assertIsNone(o._texture)
+        np.testing.assert_allclose(o.color, [1.0, 0.0, 0.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-16
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+
+import unittest
+
+import numpy as np
+import trimesh
+
+from robomeshcat.object import TriangularMeshGeometryWithAttributes
+
+
+def textured(mesh):
+    mesh.visual = trimesh.visual.TextureVisuals(uv=np.random.default_rng(0).uniform(size=(len(mesh.vertices), 2)))
+    return mesh
+
+
+class TestTriangularMeshGeometryWithAttributes(unittest.TestCase):
+    def test_sharp_edges_are_split(self):
+        box = trimesh.creation.box([1.0, 2.0, 3.0])
+        geometry = TriangularMeshGeometryWithAttributes.from_trimesh(box)
+        self.assertEqual(len(geometry.faces), len(box.faces))
+        self.assertEqual(len(geometry.normals), len(geometry.vertices))
+        self.assertEqual(len(geometry.vertices), 24)  # each corner of the box is split to three faces
+        np.testing.assert_allclose(geometry.vertices[geometry.faces], box.vertices[box.faces])
+        for i in range(3):
+            np.testing.assert_allclose(geometry.normals[geometry.faces[:, i]], box.face_normals, atol=1e-6)
+
+    def test_smooth_surface_is_not_split(self):
+        sphere = trimesh.creation.icosphere(subdivisions=2)
+        geometry = TriangularMeshGeometryWithAttributes.from_trimesh(sphere)
+        self.assertEqual(len(geometry.faces), len(sphere.faces))
+        self.assertEqual(len(geometry.vertices), len(sphere.vertices))
+        self.assertEqual(len(geometry.normals), len(geometry.vertices))
+        np.testing.assert_allclose(geometry.vertices[geometry.faces], sphere.vertices[sphere.faces], atol=1e-6)
+        normals = geometry.vertices / np.linalg.norm(geometry.vertices, axis=1, keepdims=True)
+        np.testing.assert_allclose(geometry.normals, normals, atol=0.05)
+
+    def test_normals_follow_faces_orientation(self):
+        sphere = trimesh.creation.icosphere(subdivisions=1)
+        sphere.vertex_normals = -sphere.vertices / np.linalg.norm(sphere.vertices, axis=1, keepdims=True)
+        geometry = TriangularMeshGeometryWithAttributes.from_trimesh(sphere)
+        normals = geometry.vertices / np.linalg.norm(geometry.vertices, axis=1, keepdims=True)
+        self.assertTrue(np.all(np.sum(geometry.normals * normals, axis=1) > 0.9))  # outward normals of the faces
+
+    def test_uvs_follow_split_vertices(self):
+        box = textured(trimesh.creation.box([1.0, 1.0, 1.0]))
+        geometry = TriangularMeshGeometryWithAttributes.from_trimesh(box)
+        self.assertEqual(geometry.uvs.shape, (len(geometry.vertices), 2))
+        np.testing.assert_allclose(geometry.uvs[geometry.faces], box.visual.uv[box.faces], atol=1e-6)
+        self.assertIsNone(TriangularMeshGeometryWithAttributes.from_trimesh(box, with_uvs=False).uvs)
+
+    def test_lower_contains_attributes(self):
+        geometry = TriangularMeshGeometryWithAttributes.from_trimesh(textured(trimesh.creation.box([1.0, 1.0, 1.0])))
+        attributes = geometry.lower({})['data']['attributes']
+        self.assertEqual(set(attributes), {'position', 'normal', 'uv'})
+        self.assertEqual(attributes['uv']['itemSize'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
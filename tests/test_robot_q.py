@@ -5,8 +5,13 @@
 #     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
 #
 
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
 from robomeshcat import Robot
 
 
@@ -22,6 +27,44 @@ class TestRobot(unittest.TestCase):
         robot = Robot(urdf_path=Path(__file__).parent / 'test_urdf.urdf')
         self.assertRaises(KeyError, lambda: robot["wrong_key"])
 
+    def test_q_by_list_of_names(self):
+        robot = Robot(urdf_path=Path(__file__).parent / 'test_urdf.urdf')
+        robot[['elbow_joint', 'shoulder_pan_joint']] = [0.3, 0.4]
+        np.testing.assert_allclose(robot[['shoulder_pan_joint', 'elbow_joint']], [0.4, 0.3])
+        np.testing.assert_allclose(robot[:3], [0.4, 0.0, 0.3])
+        self.assertRaises(KeyError, lambda: robot[['elbow_joint', 'wrong_key']])
+
+    def test_set_q_computes_fk_once(self):
+        with mock.patch.object(Robot, '_fk', autospec=True) as fk:
+            robot = Robot(urdf_path=Path(__file__).parent / 'test_urdf.urdf')
+            robot.set_q(np.arange(6) * 0.1)
+            self.assertEqual(fk.call_count, 1)
+            robot.set_q({'elbow_joint': 1.0, 'shoulder_pan_joint': 2.0})
+            self.assertEqual(fk.call_count, 2)
+            robot.update(q={'wrist_1_joint': 3.0}, pose=np.diag([1.0, 1.0, 1.0, 1.0]))
+            self.assertEqual(fk.call_count, 3)
+        self.assertAlmostEqual(robot['shoulder_pan_joint'], 2.0)
+        self.assertAlmostEqual(robot['shoulder_lift_joint'], 0.1)
+        self.assertAlmostEqual(robot['elbow_joint'], 1.0)
+        self.assertAlmostEqual(robot['wrist_1_joint'], 3.0)
+
+    def test_subtree_fk_matches_full_fk(self):
+        with tempfile.TemporaryDirectory() as d:
+            urdf = (Path(__file__).parent / 'test_urdf.urdf').read_text()
+            urdf_path = Path(d) / 'robot.urdf'
+            urdf_path.write_text(urdf.replace('<geometry>', '<geometry><box size="0.1 0.1 0.1"/>'))
+            robot = Robot(urdf_path=urdf_path)
+        for o in robot._objects.values():
+            o._vis = mock.MagicMock()  # robot is not in the scene, sending is not tested here
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            robot[int(rng.integers(robot._model.nq))] = rng.uniform(-np.pi, np.pi)
+            if rng.uniform() < 0.1:
+                robot.pos = rng.uniform(-1, 1, 3)
+            expected = robot.compute_link_poses(np.asarray(robot._q)[np.newaxis])[0]
+            poses = np.array([robot._objects[name].pose for name in robot.link_names])
+            np.testing.assert_allclose(poses, expected, atol=1e-12)
+
 
 if __name__ == '__main__':
     unittest.main()
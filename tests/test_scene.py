@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-16
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import meshcat
+import meshcat.geometry as g
+import numpy as np
+from meshcat.commands import SetTransform
+
+from robomeshcat import Object, Robot, Scene
+from robomeshcat.scene import sample_track
+
+Visualizer = meshcat.Visualizer
+
+
+def create_scene(**kwargs) -> Scene:
+    """Create a scene whose visualizer sends commands into the mocked window."""
+    window = mock.MagicMock()
+    with mock.patch('robomeshcat.scene.meshcat.Visualizer', lambda: Visualizer(window=window)):
+        return Scene(open=False, wait_for_open=False, **kwargs)
+
+
+def sent_transforms(scene: Scene) -> list:
+    """Return the transformation commands sent to the window of the scene and reset the record of the sent commands."""
+    commands = [c.args[0] for c in scene._sender._window.send.call_args_list]
+    scene._sender._window.send.reset_mock()
+    return [c for c in commands if isinstance(c, SetTransform)]
+
+
+def create_robot(**kwargs) -> Robot:
+    """Create a robot from the test urdf with box geometries of the links."""
+    with tempfile.TemporaryDirectory() as d:
+        urdf = (Path(__file__).parent / 'test_urdf.urdf').read_text()
+        urdf_path = Path(d) / 'robot.urdf'
+        urdf_path.write_text(urdf.replace('<geometry>', '<geometry><box size="0.1 0.1 0.1"/>'))
+        return Robot(urdf_path=urdf_path, **kwargs)
+
+
+class TestScene(unittest.TestCase):
+    def test_deferred_mode_sends_last_pose_on_render(self):
+        scene = create_scene(deferred=True)
+        obj = Object(g.Box([0.1, 0.1, 0.1]))
+        scene.add_object(obj)
+        sent_transforms(scene)
+        for x in [0.1, 0.2, 0.3]:
+            obj.pos[0] = x
+        self.assertEqual(len(sent_transforms(scene)), 0)
+        scene.render()
+        sent = sent_transforms(scene)
+        self.assertEqual(len(sent), 1)
+        self.assertAlmostEqual(sent[0].matrix[0, 3], 0.3)
+        scene.render()
+        self.assertEqual(len(sent_transforms(scene)), 0)
+
+    def test_disabling_deferred_mode_sends_postponed_poses(self):
+        scene = create_scene(deferred=True)
+        obj = Object(g.Box([0.1, 0.1, 0.1]))
+        scene.add_object(obj)
+        sent_transforms(scene)
+        obj.pos[0] = 0.1
+        scene.deferred = False
+        self.assertEqual(len(sent_transforms(scene)), 1)
+        obj.pos[0] = 0.2
+        self.assertEqual(len(sent_transforms(scene)), 1)
+
+    def test_batch_sends_poses_at_the_end_of_outermost_batch(self):
+        scene = create_scene()
+        objects = [Object(g.Box([0.1, 0.1, 0.1])) for _ in range(3)]
+        for o in objects:
+            scene.add_object(o)
+        sent_transforms(scene)
+        with scene.batch():
+            with scene.batch():
+                for o in objects:
+                    o.pos[0] += 0.1
+                    o.pos[1] += 0.1
+            self.assertEqual(len(sent_transforms(scene)), 0)
+            objects[0].pos[2] = 0.1
+        self.assertEqual(len(sent_transforms(scene)), 3)
+        self.assertFalse(scene.deferred)
+        objects[0].pos[2] = 0.2
+        self.assertEqual(len(sent_transforms(scene)), 1)
+
+    def test_lazy_robot_sends_poses_on_render(self):
+        scene = create_scene()
+        robot = create_robot(lazy_fk=True)
+        scene.add_robot(robot)
+        sent_transforms(scene)
+        with mock.patch.object(Robot, '_fk', autospec=True, side_effect=Robot._fk) as fk:
+            robot[0] = 0.5
+            robot[2] = 0.3
+            robot.pos = [0.1, 0.2, 0.3]
+            self.assertEqual(fk.call_count, 0)
+            self.assertEqual(len(sent_transforms(scene)), 0)
+            scene.render()
+            self.assertEqual(fk.call_count, 1)
+        self.assertGreater(len(sent_transforms(scene)), 0)
+        expected = robot.compute_link_poses(np.asarray(robot._q)[np.newaxis])[0]
+        poses = np.array([robot._objects[name].pose for name in robot.link_names])
+        np.testing.assert_allclose(poses, expected, atol=1e-12)
+
+    def test_unchanged_pose_is_not_sent(self):
+        scene = create_scene()
+        obj = Object(g.Box([0.1, 0.1, 0.1]))
+        scene.add_object(obj)
+        sent_transforms(scene)
+        obj.pos = [0.0, 0.0, 0.0]
+        obj.rot = np.eye(3)
+        self.assertEqual(len(sent_transforms(scene)), 0)
+        obj.pos[0] = 1e-9
+        self.assertEqual(len(sent_transforms(scene)), 1)
+
+    def test_pose_within_tolerances_is_not_sent(self):
+        scene = create_scene()
+        obj = Object(g.Box([0.1, 0.1, 0.1]))
+        obj.pos_tolerance, obj.rot_tolerance = 0.01, np.deg2rad(1)
+        scene.add_object(obj)
+        sent_transforms(scene)
+        obj.pos[0] = 0.005
+        self.assertEqual(len(sent_transforms(scene)), 0)
+        obj.pos[0] = 0.015  # the distance is measured from the last sent pose, i.e. from the origin
+        self.assertEqual(len(sent_transforms(scene)), 1)
+        c, s = np.cos(np.deg2rad(0.5)), np.sin(np.deg2rad(0.5))
+        obj.rot = [[c, -s, 0], [s, c, 0], [0, 0, 1]]
+        self.assertEqual(len(sent_transforms(scene)), 0)
+        c, s = np.cos(np.deg2rad(2)), np.sin(np.deg2rad(2))
+        obj.rot = [[c, -s, 0], [s, c, 0], [0, 0, 1]]
+        self.assertEqual(len(sent_transforms(scene)), 1)
+
+    def test_sparse_animation_recording(self):
+        scene = create_scene()
+        moving, static = Object(g.Box([0.1, 0.1, 0.1])), Object(g.Box([0.1, 0.1, 0.1]))
+        scene.add_object(moving)
+        scene.add_object(static)
+        sent_transforms(scene)
+        with scene.animation(fps=10) as ctx:
+            scene.render()  # frame 0 with the full state
+            scene.render()
+            moving.pos[0] = 1.0
+            scene.render()  # frame 2 with the change, the guard keyframe is in frame 1
+            scene.render()
+        self.assertEqual(scene._sender._window.send.call_count, 1)  # only the animation is sent
+        clips = ctx.animation.clips
+        position = clips[scene.vis[moving.name].path].tracks['position']
+        self.assertEqual(list(position.frames), [0, 1, 2, 4])
+        np.testing.assert_allclose(np.asarray(position.values)[:, 0], [0, 0, 1, 1])
+        self.assertEqual(list(clips[scene.vis[static.name].path].tracks['position'].frames), [0, 4])
+        for o in [moving, static]:
+            self.assertEqual(set(clips[scene.vis[o.name].path].tracks), {'position', 'quaternion'})
+            material = clips[scene.vis[o.name]['<object>'].path].tracks
+            self.assertEqual(set(material), {'material.color', 'material.opacity', 'visible'})
+        for clip in clips.values():  # all tracks start with the full state and end at the same frame
+            for track in clip.tracks.values():
+                self.assertEqual(track.frames[0], 0)
+                self.assertEqual(track.frames[-1], 4)
+
+    def test_chunks_saved_into_directory_are_joined(self):
+        scene = create_scene()
+        moving, static = Object(g.Box([0.1, 0.1, 0.1])), Object(g.Box([0.1, 0.1, 0.1]))
+        scene.add_object(moving)
+        scene.add_object(static)
+        with tempfile.TemporaryDirectory() as d:
+            with scene.animation(fps=10, chunk_duration=0.5, chunk_directory=d) as ctx:
+                for i in range(12):
+                    moving.pos[0] = i
+                    scene.render()
+                moving.pos[0] = 12
+            self.assertEqual([f.name for f in ctx.chunk_files], [f'chunk_00000{i}.npz' for i in range(3)])
+            self.assertEqual(ctx.animation.clips[scene.vis[moving.name].path].tracks['position'].frames[-1], 2)
+            for clip in ctx.animation.clips.values():
+                for track in clip.tracks.values():
+                    self.assertEqual(track.frames[-1], 2)
+            with np.load(ctx.chunk_files[0]) as first, np.load(ctx.chunk_files[1]) as second:
+                self.assertIn('objects', first)  # geometries are saved only with the first chunk
+                self.assertNotIn('objects', second)
+            animation = scene.load_animation(d, play=False)
+        position = animation.clips[scene.vis[moving.name].path].tracks['position']
+        np.testing.assert_allclose(sample_track(position, np.arange(13))[:, 0], np.arange(13))
+        for clip in animation.clips.values():
+            for track in clip.tracks.values():
+                self.assertEqual(track.frames[-1], 12)
+
+    def test_animate_empty_trajectory(self):
+        scene = create_scene()
+        robot = create_robot()
+        scene.add_robot(robot)
+        animation = scene.animate_trajectory(robot, np.empty((0, robot._model.nq)))
+        self.assertTrue(all(len(t.frames) == 0 for clip in animation.clips.values() for t in clip.tracks.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-16
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+
+import threading
+import unittest
+
+import numpy as np
+from meshcat.commands import Delete, SetProperty, SetTransform
+from meshcat.path import Path
+
+from robomeshcat.sender import CoalescingOutbox, CommandSender
+
+
+def transform(name, x):
+    pose = np.eye(4)
+    pose[0, 3] = x
+    return SetTransform(pose, Path(('meshcat', name)))
+
+
+class StalledWindow:
+    """Window that records lowered commands and blocks sending until released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.received = threading.Event()  # set when the first command is being sent
+        self.released = threading.Event()
+        self.sent = []
+
+    def send(self, command):
+        self.received.set()
+        self.released.wait()
+        self.sent.append(command.lower())
+
+
+def drain(outbox):
+    commands = []
+    while len(outbox) > 0:
+        commands.append(outbox.popleft())
+    return commands
+
+
+class TestCoalescingOutbox(unittest.TestCase):
+    def test_newer_update_replaces_queued_one_in_place(self):
+        outbox = CoalescingOutbox()
+        a1, b, a2 = transform('a', 1), transform('b', 1), transform('a', 2)
+        for c in [a1, b, a2]:
+            outbox.append(c)
+        self.assertEqual(drain(outbox), [a2, b])
+
+    def test_properties_are_coalesced_per_key(self):
+        outbox = CoalescingOutbox()
+        path = Path(('meshcat', 'a'))
+        visible, opacity = SetProperty('visible', True, path), SetProperty('opacity', 0.5, path)
+        hidden = SetProperty('visible', False, path)
+        for c in [visible, opacity, hidden]:
+            outbox.append(c)
+        self.assertEqual(drain(outbox), [hidden, opacity])
+
+    def test_updates_are_not_coalesced_over_command_without_key(self):
+        outbox = CoalescingOutbox()
+        a1, delete, a2 = transform('a', 1), Delete(Path(('meshcat', 'b'))), transform('a', 2)
+        for c in [a1, delete, a2]:
+            outbox.append(c)
+        self.assertEqual(drain(outbox), [a1, delete, a2])
+
+    def test_replace_only_in_current_generation(self):
+        outbox = CoalescingOutbox()
+        outbox.append(transform('a', 1))
+        outbox.append(Delete(Path(('meshcat', 'b'))))
+        self.assertFalse(outbox.replace(transform('a', 2)))
+        self.assertFalse(outbox.replace(Delete(Path(('meshcat', 'b')))))
+        outbox.append(transform('a', 3))
+        self.assertTrue(outbox.replace(transform('a', 4)))
+        self.assertEqual([c.matrix[0, 3] for c in drain(outbox) if isinstance(c, SetTransform)], [1, 4])
+
+
+class TestCommandSender(unittest.TestCase):
+    def test_sync_send_is_immediate(self):
+        window = StalledWindow()
+        window.released.set()
+        sender = CommandSender(window)
+        sender.send(transform('a', 1))
+        self.assertEqual(len(window.sent), 1)
+
+    def sent_after_overflow(self, policy):
+        """Send five transforms through the queue of size two while the window is stalled."""
+        window = StalledWindow()
+        sender = CommandSender(window, async_send=True, queue_size=2, policy=policy)
+        sender.send(transform('in_flight', 0))
+        self.assertTrue(window.received.wait(timeout=5))  # the first command is taken by the sending thread
+        sender.send(Delete(Path(('meshcat', 'd'))))
+        for name, x in [('a', 1), ('b', 2), ('a', 3)]:
+            sender.send(transform(name, x))
+        window.released.set()
+        sender.flush()
+        return [(c['path'], c.get('matrix', [0] * 16)[12]) for c in window.sent]
+
+    def test_drop_oldest_keeps_commands_without_key(self):
+        sent = self.sent_after_overflow('drop_oldest')
+        self.assertEqual(sent, [('/meshcat/in_flight', 0), ('/meshcat/d', 0), ('/meshcat/a', 3)])
+
+    def test_coalesce_replaces_queued_update(self):
+        window = StalledWindow()
+        sender = CommandSender(window, async_send=True, queue_size=2, policy='coalesce')
+        sender.send(transform('in_flight', 0))
+        self.assertTrue(window.received.wait(timeout=5))
+        for name, x in [('a', 1), ('b', 2), ('a', 3), ('b', 4)]:
+            sender.send(transform(name, x))
+        window.released.set()
+        sender.flush()
+        self.assertEqual([c['matrix'][12] for c in window.sent], [0, 3, 4])
+
+    def test_block_waits_for_space(self):
+        window = StalledWindow()
+        sender = CommandSender(window, async_send=True, queue_size=1, policy='block')
+        sender.send(transform('a', 1))
+        sender.send(transform('a', 2))
+        blocked = threading.Thread(target=sender.send, args=(transform('a', 3),))
+        blocked.start()
+        blocked.join(0.1)
+        self.assertTrue(blocked.is_alive())
+        window.released.set()
+        blocked.join()
+        sender.flush()
+        self.assertEqual([c['matrix'][12] for c in window.sent], [1, 2, 3])
+
+    def test_error_is_raised_on_flush(self):
+        class FailingWindow:
+            def send(self, command):
+                raise RuntimeError('connection lost')
+
+        sender = CommandSender(FailingWindow(), async_send=True)
+        sender.send(transform('a', 1))
+        self.assertRaises(RuntimeError, sender.flush)
+
+    def test_close_sends_queued_commands_and_stops_thread(self):
+        window = StalledWindow()
+        sender = CommandSender(window, async_send=True, queue_size=10, policy='block')
+        for x in [1, 2, 3]:
+            sender.send(transform('a', x))
+        thread = sender._thread
+        window.released.set()
+        sender.close()
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([c['matrix'][12] for c in window.sent], [1, 2, 3])
+        sender.send(transform('a', 4))  # sent synchronously after closing
+        self.assertEqual(len(window.sent), 4)
+        sender.close()
+
+    def test_queued_transform_keeps_its_value(self):
+        for policy in CommandSender.policies:
+            window = StalledWindow()
+            sender = CommandSender(window, async_send=True, queue_size=10, policy=policy)
+            pose = np.eye(4)
+            for x in [1, 2, 3]:
+                pose[0, 3] = x
+                sender.send(SetTransform(pose, Path(('meshcat', 'obj'))))
+            window.released.set()
+            sender.flush()
+            sent_x = [c['matrix'][12] for c in window.sent]
+            self.assertEqual(sent_x[-1], 3, policy)
+            if policy != 'coalesce':
+                self.assertEqual(sent_x, [1, 2, 3], policy)
+
+
+if __name__ == '__main__':
+    unittest.main()